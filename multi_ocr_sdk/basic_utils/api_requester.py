@@ -5,36 +5,326 @@ Provides common functionality for making API requests with rate limiting,
 retry logic, and error handling.
 """
 
+import asyncio
+import gzip
+import importlib.util
+import json
 import logging
-from typing import Any, Dict, Optional
+import mimetypes
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
 
-from ..exceptions import APIError, RateLimitError, TimeoutError
+from ..exceptions import (
+    APIError,
+    ConfigurationError,
+    FileProcessingError,
+    RateLimitError,
+    TimeoutError,
+)
 from .rate_limiter import RateLimiter
 
+try:
+    import orjson
+except ImportError:  # optional speedup, install with `pip install multi-ocr-sdk[fast]`
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import httpx
+except ImportError:
+    # optional HTTP/2 transport, install with `pip install multi-ocr-sdk[http2]`
+    httpx = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:
+    # optional streaming parser, install with `pip install multi-ocr-sdk[stream]`
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
+# Phrases in an error body that mark a non-429 response as rate limiting
+_RATE_LIMIT_MARKERS = ("rate limit", "rate_limit", "quota")
+# Non-429 status codes that gateways use for throttling or exhausted quotas;
+# only these are checked for the markers above
+_THROTTLING_STATUS_CODES = (403, 503)
+
+
+@dataclass
+class _SharedConnector:
+    """A shared connector and the number of requesters currently using it."""
+
+    connector: aiohttp.TCPConnector
+    users: int = 0
+
+
+# Connectors are bound to an event loop, so shared connectors are kept per
+# running loop. Every APIRequester on that loop with the same per-host limit
+# (e.g. several clients pointing at different services) draws from the same
+# connection pool and DNS cache. Connector limits cannot be changed after
+# creation, so requesters asking for a different limit get their own.
+# A connector can only be closed on its own loop: the last requester to call
+# ``aclose()`` on that loop closes it. Entries of loops that were closed
+# without that are dropped on the next acquire, which only keeps the registry
+# from growing; their pooled connections are not closed. Requesters on loops
+# running in different threads share the registry, hence the lock.
+_SHARED_CONNECTORS: Dict[asyncio.AbstractEventLoop, Dict[int, _SharedConnector]] = {}
+_SHARED_CONNECTORS_LOCK = threading.Lock()
+
+
+def _acquire_shared_connector(
+    loop: asyncio.AbstractEventLoop, limit_per_host: int
+) -> aiohttp.TCPConnector:
+    """Return the shared connector for ``loop``, creating it on first use."""
+    with _SHARED_CONNECTORS_LOCK:
+        for closed_loop in [lp for lp in _SHARED_CONNECTORS if lp.is_closed()]:
+            del _SHARED_CONNECTORS[closed_loop]
+        entries = _SHARED_CONNECTORS.setdefault(loop, {})
+        entry = entries.get(limit_per_host)
+        if entry is None or entry.connector.closed:
+            entry = entries[limit_per_host] = _SharedConnector(
+                aiohttp.TCPConnector(
+                    limit=max(128, limit_per_host),
+                    limit_per_host=limit_per_host,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                )
+            )
+        entry.users += 1
+        return entry.connector
+
+
+async def _release_shared_connector(
+    loop: asyncio.AbstractEventLoop, limit_per_host: int
+) -> None:
+    """Drop one reference to a shared connector, closing it when unused."""
+    with _SHARED_CONNECTORS_LOCK:
+        entries = _SHARED_CONNECTORS.get(loop)
+        if not entries or limit_per_host not in entries:
+            return
+        entry = entries[limit_per_host]
+        entry.users -= 1
+        if entry.users > 0:
+            return
+        del entries[limit_per_host]
+        if not entries:
+            del _SHARED_CONNECTORS[loop]
+    await entry.connector.close()
+
 
 class APIRequester:
-    """Handles API requests with rate limiting and retry logic."""
+    """
+    Handles API requests with rate limiting and retry logic.
 
-    def __init__(self, rate_limiter: RateLimiter, timeout: int):
+    A single ``requests.Session`` is kept for the lifetime of the requester so
+    that consecutive requests reuse pooled keep-alive connections instead of
+    paying a TCP/TLS handshake each time. The async path lazily creates one
+    ``aiohttp.ClientSession`` on top of a connector shared by all requesters
+    on the same event loop. With
+    ``http2=True`` the async path uses an ``httpx.AsyncClient`` instead, so
+    concurrent requests are multiplexed over a single HTTP/2 connection. Call
+    :meth:`close` when done, or await :meth:`aclose` on the same event loop
+    when the async path was used.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        timeout: int,
+        pool_connections: int = 16,
+        pool_maxsize: int = 32,
+        http2: bool = False,
+        compress_requests: bool = False,
+        stream_responses: bool = False,
+    ):
         """
         Initialize API requester.
 
         Args:
             rate_limiter: RateLimiter instance for managing delays and retries.
             timeout: Request timeout in seconds.
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Maximum number of connections kept in each pool.
+                Also the per-host connection limit of the async connector and
+                the connection limit of the HTTP/2 client.
+            http2: Send async requests through ``httpx`` with HTTP/2 enabled.
+                HTTP/2 is only negotiated over TLS; ``http://`` URLs still use
+                HTTP/1.1. Requires the optional ``http2`` extra.
+            compress_requests: gzip-compress JSON request bodies and send them
+                with ``Content-Encoding: gzip``. The server must accept
+                compressed request bodies.
+            stream_responses: Let :meth:`request_sync_items` and
+                :meth:`request_async_items` parse the response incrementally
+                with ``ijson`` while it is being received. Requires the
+                optional ``stream`` extra.
+
+        Raises:
+            ConfigurationError: If ``http2`` or ``stream_responses`` is set but
+                the corresponding optional dependency (``httpx`` and ``h2``,
+                or ``ijson``) is not installed.
         """
+        # httpx only imports h2 when the first HTTP/2 client is built, so check
+        # for it here rather than failing on the first async request
+        if http2 and (httpx is None or importlib.util.find_spec("h2") is None):
+            raise ConfigurationError(
+                "http2=True requires httpx with HTTP/2 support (h2). "
+                "Install with: pip install multi-ocr-sdk[http2]"
+            )
+        if stream_responses and ijson is None:
+            raise ConfigurationError(
+                "stream_responses=True requires ijson. "
+                "Install with: pip install multi-ocr-sdk[stream]"
+            )
+
         self.rate_limiter = rate_limiter
         self.timeout = timeout
+        self._pool_maxsize = pool_maxsize
+
+        self._session = requests.Session()
+        # Retries are handled by our own 429 backoff loop, not by urllib3
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # aiohttp sessions are bound to the event loop they were created in
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._async_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._http2 = http2
+        self._compress_requests = compress_requests
+        self._stream_responses = stream_responses
+        self._httpx_client: Optional["httpx.AsyncClient"] = None
+        self._httpx_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session and release pooled connections.
+
+        Only the sync session is closed here. The async session and the
+        HTTP/2 client are bound to their event loop and must be released
+        with :meth:`aclose`, awaited on that same loop (e.g. before the end
+        of ``asyncio.run()``); otherwise their connections are leaked.
+        """
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """
+        Close both the sync and the async HTTP sessions.
+
+        Must be awaited on the event loop the async path was used on. Async
+        sessions belonging to another loop cannot be closed from here and
+        are only dropped.
+        """
+        self.close()
+        loop = asyncio.get_running_loop()
+        if self._async_session is not None and self._async_session_loop is loop:
+            await self._async_session.close()
+            await _release_shared_connector(loop, self._pool_maxsize)
+        self._async_session = None
+        self._async_session_loop = None
+        if self._httpx_client is not None and self._httpx_client_loop is loop:
+            await self._httpx_client.aclose()
+        self._httpx_client = None
+        self._httpx_client_loop = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared aiohttp session, creating it on first use.
+
+        A new session is created if the previous one was closed or belongs to
+        a different (e.g. finished) event loop; a session left on another
+        loop is dropped without being closed, see :meth:`aclose`. The session
+        does not own its connector; the connector is shared per loop and
+        reference counted.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_session is not None and self._async_session_loop is loop:
+            if not self._async_session.closed:
+                return self._async_session
+            # Closed externally: give back its connector reference first
+            await _release_shared_connector(loop, self._pool_maxsize)
+
+        self._async_session = aiohttp.ClientSession(
+            connector=_acquire_shared_connector(loop, self._pool_maxsize),
+            connector_owner=False,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._async_session_loop = loop
+        return self._async_session
+
+    def _get_httpx_client(self) -> "httpx.AsyncClient":
+        """
+        Return the HTTP/2 ``httpx.AsyncClient``, creating it on first use.
+
+        Like the aiohttp session, the client is recreated when it was closed
+        or belongs to a different event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._httpx_client is None
+            or self._httpx_client_loop is not loop
+            or self._httpx_client.is_closed
+        ):
+            self._httpx_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self._pool_maxsize,
+                    max_connections=self._pool_maxsize,
+                ),
+                timeout=self.timeout,
+            )
+            self._httpx_client_loop = loop
+        return self._httpx_client
+
+    def _encode_json_body(
+        self, headers: Dict[str, str], payload: Union[Dict[str, Any], bytes]
+    ) -> Tuple[Dict[str, str], bytes]:
+        """
+        Serialize ``payload`` once and build the matching request headers.
+
+        ``payload`` may also be an already serialized JSON body, in which case
+        it is sent as is. This lets callers splice large base64 data into the
+        body without a round-trip through ``str``.
+
+        With ``compress_requests`` the body is gzip-compressed at level 1:
+        base64 text shrinks by roughly a quarter for very little CPU. The
+        result is reused unchanged across retries.
+        """
+        json_headers = _with_json_content_type(headers)
+        body = payload if isinstance(payload, bytes) else _dumps_json(payload)
+        if self._compress_requests:
+            body = gzip.compress(body, compresslevel=1)
+            json_headers["Content-Encoding"] = "gzip"
+        return json_headers, body
 
     def request_sync(
         self,
         url: str,
         headers: Dict[str, str],
-        payload: Dict[str, Any],
+        payload: Union[Dict[str, Any], bytes],
         enable_rate_limit_retry: bool = True,
         timeout_override: Optional[int] = None,
     ) -> Dict[str, Any]:
@@ -44,7 +334,7 @@ class APIRequester:
         Args:
             url: API endpoint URL.
             headers: Request headers (should include Authorization).
-            payload: Request payload.
+            payload: Request payload, or a pre-serialized JSON body.
             enable_rate_limit_retry: Enable automatic retry on 429 errors.
 
         Returns:
@@ -56,55 +346,587 @@ class APIRequester:
             TimeoutError: If request times out.
         """
 
-        for attempt in range(self.rate_limiter.max_retries + 1):
+        json_headers, body = self._encode_json_body(headers, payload)
+
+        def send(timeout: float) -> requests.Response:
+            return self._session.post(
+                url, headers=json_headers, data=body, timeout=timeout
+            )
+
+        result: Dict[str, Any] = self._request_with_retry_sync(
+            send, enable_rate_limit_retry, timeout_override
+        )
+        return result
+
+    def request_sync_items(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[Dict[str, Any], bytes],
+        prefix: str,
+        enable_rate_limit_retry: bool = True,
+        timeout_override: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Like :meth:`request_sync`, but return only the values at ``prefix``.
+
+        ``prefix`` uses ijson's dotted syntax, where ``item`` stands for every
+        element of an array (e.g. ``"result.pages.item.text"``). With
+        ``stream_responses`` the body is parsed while it is received, so the
+        raw response and the full JSON document are never held in memory;
+        otherwise the response is parsed as usual and the values are picked
+        from the result.
+
+        Raises:
+            APIError: If API returns an error.
+            RateLimitError: If rate limit is exceeded and retries exhausted.
+            TimeoutError: If request times out.
+        """
+        if not self._stream_responses:
+            result = self.request_sync(
+                url, headers, payload, enable_rate_limit_retry, timeout_override
+            )
+            return _select_items(result, prefix)
+
+        json_headers, body = self._encode_json_body(headers, payload)
+
+        def send(timeout: float) -> requests.Response:
+            return self._session.post(
+                url, headers=json_headers, data=body, timeout=timeout, stream=True
+            )
+
+        def parse(response: requests.Response) -> List[Any]:
+            # Let urllib3 undo any Content-Encoding before ijson sees the bytes
+            response.raw.decode_content = True
             try:
-                # Apply rate limiting delay (updates _last_request_time atomically)
-                self.rate_limiter.apply_rate_limit_sync()
+                return list(ijson.items(response.raw, prefix, use_float=True))
+            # Reading ``response.raw`` bypasses requests' exception wrapping
+            except ReadTimeoutError as e:
+                raise self._timeout_error(timeout_override) from e
+            except ProtocolError as e:
+                raise APIError(
+                    f"Failed to read API response: {e}",
+                    status_code=response.status_code,
+                ) from e
+            finally:
+                response.close()
+
+        items: List[Any] = self._request_with_retry_sync(
+            send, enable_rate_limit_retry, timeout_override, parse
+        )
+        return items
+
+    def request_multipart_sync(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        file_path: Path,
+        fields: Dict[str, str],
+        enable_rate_limit_retry: bool = True,
+        timeout_override: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload a file as ``multipart/form-data`` with rate limiting and retry.
+
+        The raw file bytes are sent as the ``file`` part, avoiding the 33%
+        size inflation of base64-in-JSON. The file is reopened on every
+        attempt so retries always send the full content.
+
+        Args:
+            url: API endpoint URL.
+            headers: Request headers. Any ``Content-Type`` is dropped so the
+                multipart boundary header can be set automatically.
+            file_path: Path of the file to upload.
+            fields: Additional form fields sent alongside the file.
+            enable_rate_limit_retry: Enable automatic retry on 429 errors.
+
+        Returns:
+            API response as dictionary.
 
-                response = requests.post(
+        Raises:
+            FileProcessingError: If the file cannot be read.
+            APIError: If API returns an error.
+            RateLimitError: If rate limit is exceeded and retries exhausted.
+            TimeoutError: If request times out.
+        """
+        form_headers = _without_content_type(headers)
+        content_type = _guess_content_type(file_path)
+
+        def send(timeout: float) -> requests.Response:
+            with _open_upload(file_path) as f:
+                return self._session.post(
                     url,
-                    headers=headers,
-                    json=payload,
-                    timeout=timeout_override or self.timeout,
+                    headers=form_headers,
+                    files={"file": (file_path.name, f, content_type)},
+                    data=fields,
+                    timeout=timeout,
                 )
 
-                # Handle rate limiting (429)
-                if response.status_code == 429:
-                    if (
-                        not enable_rate_limit_retry
-                        or attempt >= self.rate_limiter.max_retries
-                    ):
-                        raise RateLimitError(
-                            f"Rate limit exceeded: {response.text}",
-                            status_code=429,
-                            response_text=response.text,
-                        )
-
-                    # Exponential backoff: delay * (2 ^ attempt)
-                    retry_delay = self.rate_limiter.get_retry_delay(attempt)
-                    logger.warning(
-                        f"Rate limit hit (429), retrying in {retry_delay:.1f}s "
-                        f"(attempt {attempt + 1}/{self.rate_limiter.max_retries})"
-                    )
-                    import time
-                    time.sleep(retry_delay)
-                    continue
+        result: Dict[str, Any] = self._request_with_retry_sync(
+            send, enable_rate_limit_retry, timeout_override
+        )
+        return result
+
+    def _request_with_retry_sync(
+        self,
+        send: Callable[[float], requests.Response],
+        enable_rate_limit_retry: bool,
+        timeout_override: Optional[int],
+        parse: Optional[Callable[[requests.Response], Any]] = None,
+    ) -> Any:
+        """
+        Run ``send`` with rate limiting and 429 retry, returning parsed JSON.
+
+        ``parse`` replaces the default whole-body JSON decoding of successful
+        responses, e.g. with a streaming parser.
+        """
+        for attempt in range(self._max_attempts(enable_rate_limit_retry)):
+            try:
+                # Apply rate limiting delay (updates _last_request_time atomically)
+                self.rate_limiter.apply_rate_limit_sync()
+
+                response = send(timeout_override or self.timeout)
 
                 if response.status_code != 200:
-                    raise APIError(
-                        f"API request failed: {response.text}",
-                        status_code=response.status_code,
-                        response_text=response.text,
+                    retry_delay = self._retry_delay_or_raise(
+                        attempt,
+                        enable_rate_limit_retry,
+                        response.status_code,
+                        response.text,
+                        response.headers.get("Retry-After"),
                     )
+                    self.rate_limiter.retry_sleep(retry_delay)
+                    continue
 
-                result: Dict[str, Any] = response.json()
-                return result
+                if parse is not None:
+                    return parse(response)
+                return _loads_json(response.content)
 
             except requests.Timeout as e:
-                actual_timeout = timeout_override if timeout_override is not None else self.timeout
-                raise TimeoutError(
-                    f"Request timed out after {actual_timeout} seconds"
+                raise self._timeout_error(timeout_override) from e
+
+        # Should not reach here, but just in case
+        raise RateLimitError("Rate limit retries exhausted", status_code=429)
+
+    async def request_async(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[Dict[str, Any], bytes],
+        enable_rate_limit_retry: bool = True,
+        timeout_override: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make asynchronous API request with rate limiting and retry.
+
+        Args:
+            url: API endpoint URL.
+            headers: Request headers (should include Authorization).
+            payload: Request payload, or a pre-serialized JSON body.
+            enable_rate_limit_retry: Enable automatic retry on 429 errors.
+
+        Returns:
+            API response as dictionary.
+
+        Raises:
+            APIError: If API returns an error.
+            RateLimitError: If rate limit is exceeded and retries exhausted.
+            TimeoutError: If request times out.
+        """
+        # Serializing and gzip-compressing a multi-megabyte body would block the
+        # event loop, so it runs in a worker thread like the base64 encoding
+        json_headers, body = await asyncio.to_thread(
+            self._encode_json_body, headers, payload
+        )
+
+        if self._http2:
+            result: Dict[str, Any] = await self._request_with_retry_httpx(
+                self._httpx_json_sender(url, json_headers, body),
+                enable_rate_limit_retry,
+                timeout_override,
+            )
+            return result
+
+        session = await self._get_session()
+
+        @asynccontextmanager
+        async def send(
+            timeout: aiohttp.ClientTimeout,
+        ) -> AsyncIterator[aiohttp.ClientResponse]:
+            async with session.post(
+                url, headers=json_headers, data=body, timeout=timeout
+            ) as response:
+                yield response
+
+        result = await self._request_with_retry_async(
+            send, enable_rate_limit_retry, timeout_override
+        )
+        return result
+
+    async def request_async_items(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[Dict[str, Any], bytes],
+        prefix: str,
+        enable_rate_limit_retry: bool = True,
+        timeout_override: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Asynchronous version of :meth:`request_sync_items`.
+
+        Streaming is only available on the aiohttp transport; with ``http2``
+        the response is parsed as a whole and the values are picked from it.
+        """
+        if not self._stream_responses:
+            result = await self.request_async(
+                url, headers, payload, enable_rate_limit_retry, timeout_override
+            )
+            return _select_items(result, prefix)
+
+        # Off the event loop, see request_async
+        json_headers, body = await asyncio.to_thread(
+            self._encode_json_body, headers, payload
+        )
+
+        if self._http2:
+            # httpx has already buffered the body; parse it whole and pick the values
+            items: List[Any] = await self._request_with_retry_httpx(
+                self._httpx_json_sender(url, json_headers, body),
+                enable_rate_limit_retry,
+                timeout_override,
+                lambda response: _select_items(_loads_json(response.content), prefix),
+            )
+            return items
+
+        session = await self._get_session()
+
+        @asynccontextmanager
+        async def send(
+            timeout: aiohttp.ClientTimeout,
+        ) -> AsyncIterator[aiohttp.ClientResponse]:
+            async with session.post(
+                url, headers=json_headers, data=body, timeout=timeout
+            ) as response:
+                yield response
+
+        async def parse(response: aiohttp.ClientResponse) -> List[Any]:
+            try:
+                return [
+                    item
+                    async for item in ijson.items(
+                        response.content, prefix, use_float=True
+                    )
+                ]
+            except aiohttp.ClientPayloadError as e:
+                raise APIError(
+                    f"Failed to read API response: {e}",
+                    status_code=response.status,
                 ) from e
 
+        items = await self._request_with_retry_async(
+            send, enable_rate_limit_retry, timeout_override, parse
+        )
+        return items
+
+    async def request_multipart_async(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        file_path: Path,
+        fields: Dict[str, str],
+        enable_rate_limit_retry: bool = True,
+        timeout_override: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Asynchronous version of :meth:`request_multipart_sync`.
+
+        aiohttp streams the file body from disk instead of loading it into
+        memory first.
+        """
+        form_headers = _without_content_type(headers)
+        content_type = _guess_content_type(file_path)
+
+        if self._http2:
+            client = self._get_httpx_client()
+
+            async def send_httpx(timeout: float) -> "httpx.Response":
+                with _open_upload(file_path) as f:
+                    return await client.post(
+                        url,
+                        headers=form_headers,
+                        files={"file": (file_path.name, f, content_type)},
+                        data=fields,
+                        timeout=timeout,
+                    )
+
+            result: Dict[str, Any] = await self._request_with_retry_httpx(
+                send_httpx, enable_rate_limit_retry, timeout_override
+            )
+            return result
+
+        session = await self._get_session()
+
+        @asynccontextmanager
+        async def send(
+            timeout: aiohttp.ClientTimeout,
+        ) -> AsyncIterator[aiohttp.ClientResponse]:
+            with _open_upload(file_path) as f:
+                form = aiohttp.FormData()
+                form.add_field(
+                    "file", f, filename=file_path.name, content_type=content_type
+                )
+                for name, value in fields.items():
+                    form.add_field(name, value)
+                async with session.post(
+                    url, headers=form_headers, data=form, timeout=timeout
+                ) as response:
+                    yield response
+
+        result = await self._request_with_retry_async(
+            send, enable_rate_limit_retry, timeout_override
+        )
+        return result
+
+    def _httpx_json_sender(
+        self, url: str, json_headers: Dict[str, str], body: bytes
+    ) -> Callable[[float], Awaitable["httpx.Response"]]:
+        """Return a ``send`` callable posting ``body`` through the HTTP/2 client."""
+        client = self._get_httpx_client()
+
+        async def send(timeout: float) -> "httpx.Response":
+            return await client.post(
+                url, headers=json_headers, content=body, timeout=timeout
+            )
+
+        return send
+
+    async def _request_with_retry_async(
+        self,
+        send: Callable[
+            [aiohttp.ClientTimeout],
+            AsyncContextManager[aiohttp.ClientResponse],
+        ],
+        enable_rate_limit_retry: bool,
+        timeout_override: Optional[int],
+        parse: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+    ) -> Any:
+        """Async counterpart of :meth:`_request_with_retry_sync`."""
+        # Always pass an explicit timeout: aiohttp reads ``timeout=None`` as
+        # "no timeout at all", not as "use the session default"
+        request_timeout = aiohttp.ClientTimeout(
+            total=timeout_override if timeout_override is not None else self.timeout
+        )
+
+        for attempt in range(self._max_attempts(enable_rate_limit_retry)):
+            try:
+                await self.rate_limiter.apply_rate_limit_async()
+
+                async with send(request_timeout) as response:
+                    if response.status == 200:
+                        if parse is not None:
+                            return await parse(response)
+                        return _loads_json(await response.read())
+
+                    retry_delay = self._retry_delay_or_raise(
+                        attempt,
+                        enable_rate_limit_retry,
+                        response.status,
+                        await response.text(),
+                        response.headers.get("Retry-After"),
+                    )
+
+            except asyncio.TimeoutError as e:
+                raise self._timeout_error(timeout_override) from e
+
+            # Back off after leaving the response, so the connection is
+            # returned to the pool instead of being held while sleeping
+            await asyncio.sleep(retry_delay)
+
         # Should not reach here, but just in case
         raise RateLimitError("Rate limit retries exhausted", status_code=429)
+
+    async def _request_with_retry_httpx(
+        self,
+        send: Callable[[float], Awaitable["httpx.Response"]],
+        enable_rate_limit_retry: bool,
+        timeout_override: Optional[int],
+        parse: Optional[Callable[["httpx.Response"], Any]] = None,
+    ) -> Any:
+        """Variant of :meth:`_request_with_retry_async` for the httpx transport."""
+        for attempt in range(self._max_attempts(enable_rate_limit_retry)):
+            try:
+                await self.rate_limiter.apply_rate_limit_async()
+
+                response = await send(timeout_override or self.timeout)
+
+                if response.status_code != 200:
+                    retry_delay = self._retry_delay_or_raise(
+                        attempt,
+                        enable_rate_limit_retry,
+                        response.status_code,
+                        response.text,
+                        response.headers.get("Retry-After"),
+                    )
+                    await asyncio.sleep(retry_delay)
+                    continue
+
+                if parse is not None:
+                    return parse(response)
+                return _loads_json(response.content)
+
+            except httpx.TimeoutException as e:
+                raise self._timeout_error(timeout_override) from e
+
+        # Should not reach here, but just in case
+        raise RateLimitError("Rate limit retries exhausted", status_code=429)
+
+    def _max_attempts(self, enable_rate_limit_retry: bool) -> int:
+        """Number of attempts per request; exactly one when retry is disabled."""
+        return self.rate_limiter.max_retries + 1 if enable_rate_limit_retry else 1
+
+    def _retry_delay_or_raise(
+        self,
+        attempt: int,
+        enable_rate_limit_retry: bool,
+        status_code: int,
+        response_text: str,
+        retry_after: Optional[str],
+    ) -> float:
+        """
+        Decide what to do with a non-200 response; shared by every transport.
+
+        Returns how long to wait before the next attempt when the response is
+        a rate limit that may still be retried. Honors ``Retry-After``, else
+        uses jittered exponential backoff.
+
+        Raises:
+            RateLimitError: If rate limited and retries are exhausted or
+                disabled, or if ``Retry-After`` asks for a longer wait than the
+                rate limiter's ``max_retry_delay``.
+            APIError: For any other error response.
+        """
+        if not _is_rate_limited(status_code, response_text):
+            raise APIError(
+                f"API request failed: {response_text}",
+                status_code=status_code,
+                response_text=response_text,
+            )
+        if not self.rate_limiter.should_retry(attempt, enable_rate_limit_retry):
+            raise RateLimitError(
+                f"Rate limit exceeded: {response_text}",
+                status_code=status_code,
+                response_text=response_text,
+            )
+        retry_delay = self.rate_limiter.get_retry_delay(attempt, retry_after)
+        if self.rate_limiter.exceeds_max_delay(retry_delay):
+            # Retrying before Retry-After would only be rejected again
+            raise RateLimitError(
+                f"Rate limit exceeded, server asked to retry after "
+                f"{retry_delay:.0f}s (max_retry_delay="
+                f"{self.rate_limiter.max_retry_delay:.0f}s): {response_text}",
+                status_code=status_code,
+                response_text=response_text,
+            )
+        logger.warning(
+            f"Rate limit hit ({status_code}), "
+            f"retrying in {retry_delay:.1f}s "
+            f"(attempt {attempt + 1}/{self.rate_limiter.max_retries})"
+        )
+        return retry_delay
+
+    def _timeout_error(self, timeout_override: Optional[int]) -> TimeoutError:
+        """Build the TimeoutError raised when a request exceeds its timeout."""
+        actual_timeout = (
+            timeout_override if timeout_override is not None else self.timeout
+        )
+        return TimeoutError(f"Request timed out after {actual_timeout} seconds")
+
+
+def _is_rate_limited(status_code: int, response_text: str) -> bool:
+    """
+    Decide whether an error response should be retried as a rate limit.
+
+    Besides 429, some gateways report throttling or an exhausted quota with
+    403 or 503; those are recognized by their body. Other codes never are,
+    so e.g. a 400 validation error mentioning a ``rate_limit`` field is not
+    retried.
+    """
+    if status_code == 429:
+        return True
+    if status_code not in _THROTTLING_STATUS_CODES:
+        return False
+    text = response_text.lower()
+    return any(marker in text for marker in _RATE_LIMIT_MARKERS)
+
+
+def _select_items(document: Any, prefix: str) -> List[Any]:
+    """
+    Pick the values at an ijson-style ``prefix`` from a parsed document.
+
+    Used when the response was not streamed, so that callers get the same
+    result with or without ``stream_responses``.
+    """
+    nodes = [document]
+    for key in prefix.split("."):
+        selected: List[Any] = []
+        for node in nodes:
+            if key == "item":
+                if isinstance(node, list):
+                    selected.extend(node)
+            elif isinstance(node, dict) and key in node:
+                selected.append(node[key])
+        nodes = selected
+    return nodes
+
+
+def _dumps_json(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialize a request payload to JSON bytes.
+
+    Payloads may carry multi-megabyte base64 strings, so ``orjson`` is used
+    when installed; it is several times faster than the stdlib encoder and
+    returns bytes directly. Falls back to ``json`` otherwise. The payload is
+    serialized once, up front, and reused across retries.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _loads_json(body: bytes) -> Any:
+    """
+    Parse a JSON response body.
+
+    Decodes straight from the raw bytes (via ``orjson`` when installed), so
+    large responses are not first copied into an intermediate ``str`` the
+    way ``response.json()`` / ``response.text`` do.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _with_json_content_type(headers: Dict[str, str]) -> Dict[str, str]:
+    """Return a copy of ``headers`` declaring a JSON request body."""
+    json_headers = _without_content_type(headers)
+    json_headers["Content-Type"] = "application/json"
+    return json_headers
+
+
+def _without_content_type(headers: Dict[str, str]) -> Dict[str, str]:
+    """Drop Content-Type so the HTTP client can set the multipart boundary."""
+    return {k: v for k, v in headers.items() if k.lower() != "content-type"}
+
+
+def _guess_content_type(file_path: Path) -> str:
+    """Guess the MIME type of an upload from its extension."""
+    return mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+
+
+def _open_upload(file_path: Path) -> BinaryIO:
+    """Open a file for upload, converting OS errors to FileProcessingError."""
+    try:
+        return open(file_path, "rb")
+    except OSError as e:
+        raise FileProcessingError(f"Failed to read file '{file_path}': {e}") from e
@@ -3,10 +3,12 @@
 这是一个用于异步处理的函数，但是现在把异步砍掉了，这个函数好像没用了？等看完全部代码再说
 """
 
+import asyncio
 import logging
+import random
 import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,8 @@ class RateLimiter:
         request_delay: float = 0.0, 
         max_retries: int = 3,
         retry_delay: float = 5.0,
+        max_retry_delay: float = 60.0,
+        retry_sleep: Optional[Callable[[float], None]] = None,
     ):
         """
         初始化rate limiter。
@@ -26,15 +30,27 @@ class RateLimiter:
             request_delay: API请求之间的延迟时间（秒）。
             max_retries: 速率限制错误的最大重试次数。
             retry_delay: 重试前的初始延迟时间（秒）（指数退避）
+            max_retry_delay: 计算出的退避延迟的上限（秒）。不限制服务端 Retry-After
+                给出的等待时间，超过该值时由调用方决定放弃重试（见 exceeds_max_delay）
+            retry_sleep: 同步请求遇到 429 后用于等待的函数，为 None 时使用 time.sleep。
+                在线程池中批量调用时，可替换为可被取消的等待
+                （如 threading.Event().wait），避免线程在退避期间无法退出。
         """
         self.request_delay = request_delay
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.retry_sleep = retry_sleep if retry_sleep is not None else time.sleep
 
         # 记录上一次请求的时间，用于速率限制
         self._last_request_time: Optional[float] = None
         # 确保线程安全的速率限制
         self._sync_lock = threading.Lock()
+        # 异步场景下使用 asyncio.Lock，保证并发协程之间的请求间隔。
+        # asyncio.Lock 会绑定到首次发生等待时的事件循环，因此按事件循环懒创建，
+        # 同一实例用于多次 asyncio.run() 时不会报 "bound to a different event loop"
+        self._async_lock: Optional[asyncio.Lock] = None
+        self._async_lock_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def apply_rate_limit_sync(self) -> None:
         """
@@ -60,11 +76,52 @@ class RateLimiter:
                 # 在锁内更新上一次请求时间，避免竞争条件
                 self._last_request_time = time.time()
 
-    def get_retry_delay(self, attempt: int) -> float:
+    async def apply_rate_limit_async(self) -> None:
         """
-        计算重试延迟时间，第一次是2的1次方，第二次是2的2次方，以此类推。
+        apply_rate_limit_sync 的异步版本。
+        使用 asyncio.Lock 串行化并发协程，等待期间不阻塞事件循环。
         """
-        return self.retry_delay * (2**attempt)
+        if self.request_delay > 0:
+            async with self._get_async_lock():
+                if self._last_request_time is not None:
+                    elapsed = time.time() - self._last_request_time
+                    if elapsed < self.request_delay:
+                        delay = self.request_delay - elapsed
+                        logger.debug(
+                            f"Rate limiting: waiting {delay:.2f}s before next request"
+                        )
+                        await asyncio.sleep(delay)
+                self._last_request_time = time.time()
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        """返回当前事件循环上的 asyncio.Lock，必要时新建。"""
+        loop = asyncio.get_running_loop()
+        if self._async_lock is None or self._async_lock_loop is not loop:
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        return self._async_lock
+
+    def get_retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        计算重试延迟时间。
+        如果服务端通过 Retry-After 响应头给出了等待秒数，优先使用该值；
+        否则在 [0, retry_delay * 2^attempt] 区间内随机取值（full jitter 指数退避），
+        即使是第一次重试也错开各客户端的重试时刻，避免同时被限流后又同时重试（惊群）。
+        只有计算出的退避延迟受 max_retry_delay 限制；Retry-After 原样返回，
+        若提前重试只会再次被拒绝，白白消耗重试次数。
+        """
+        delay = _parse_retry_after(retry_after)
+        if delay is not None:
+            return delay
+        backoff = random.uniform(0.0, self.retry_delay * (2**attempt))
+        return min(backoff, self.max_retry_delay)
+
+    def exceeds_max_delay(self, delay: float) -> bool:
+        """
+        服务端要求的等待时间（Retry-After）超过 max_retry_delay 时返回 True，
+        调用方应立即抛出 RateLimitError，而不是等待过久或提前重试。
+        """
+        return delay > self.max_retry_delay
 
     def should_retry(self, attempt: int, enable_retry: bool) -> bool:
         """
@@ -73,4 +130,17 @@ class RateLimiter:
         """
         return enable_retry and attempt < self.max_retries
 
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头（仅支持秒数形式），无法解析时返回 None。
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds >= 0 else None
+
 # 20251219结束人工审阅
\ No newline at end of file
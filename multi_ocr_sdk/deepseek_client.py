@@ -8,7 +8,7 @@ using shared utilities from basic_utils for file processing, rate limiting, and
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from .config import OCRConfig
 from .enums import OCRMode
@@ -32,6 +32,9 @@ class DeepSeekOCR:
         >>> client = DeepSeekOCR(api_key="your_api_key")
         >>> result = client.parse("document.pdf")
         >>> print(result)
+        >>> # Close pooled connections automatically
+        >>> with DeepSeekOCR(api_key="your_api_key") as client:
+        ...     result = client.parse("document.pdf")
 
     Attributes:
         config: OCRConfig instance containing all configuration.
@@ -49,6 +52,7 @@ class DeepSeekOCR:
         enable_rate_limit_retry: Optional[bool] = None,
         max_rate_limit_retries: Optional[int] = None,
         rate_limit_retry_delay: Optional[float] = None,
+        retry_sleep: Optional[Callable[[float], None]] = None,
         **kwargs: str,
     ):
         """
@@ -70,6 +74,9 @@ class DeepSeekOCR:
                                    limit errors.
             rate_limit_retry_delay: Initial delay in seconds before retrying
                                    after 429 error (uses exponential backoff).
+            retry_sleep: Function used to wait between rate limit retries of
+                        synchronous requests (default: time.sleep), e.g. an
+                        interruptible threading.Event().wait.
             **kwargs: Additional configuration parameters.
 
         Raises:
@@ -110,8 +117,24 @@ class DeepSeekOCR:
             request_delay=self.config.request_delay,
             max_retries=self.config.max_rate_limit_retries,
             retry_delay=self.config.rate_limit_retry_delay,
+            retry_sleep=retry_sleep,
         )
         self._api_requester = APIRequester(self._rate_limiter, self.config.timeout)
+        # The API key is fixed for the client's lifetime, so build headers once
+        self._headers = {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def __enter__(self) -> "DeepSeekOCR":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and release pooled connections."""
+        self._api_requester.close()
 
     def _build_prompt(self, mode: OCRMode) -> str:
         """
@@ -251,15 +274,10 @@ class DeepSeekOCR:
                 "max_tokens": self.config.max_tokens,
             }
 
-            headers = {
-                "Authorization": f"Bearer {self.config.api_key}",
-                "Content-Type": "application/json",
-            }
-
             # Make API request using shared requester
             result = self._api_requester.request_sync(
                 self.config.base_url,
-                headers,
+                self._headers,
                 payload,
                 enable_rate_limit_retry=self.config.enable_rate_limit_retry,
             )
@@ -318,7 +336,7 @@ class DeepSeekOCR:
 
                     fallback_result = self._api_requester.request_sync(
                         self.config.base_url,
-                        headers,
+                        self._headers,
                         fallback_payload,
                         enable_rate_limit_retry=self.config.enable_rate_limit_retry,
                     )
@@ -7,6 +7,10 @@
   1. 读取本地文件（PDF 或图片），使用 Base64 编码后发送到 /layout-parsing 接口
   2. 将解析结果发送到 /restructure-pages 接口，合并多页结果并返回 Markdown 文本
 
+同步接口 parse() 逐个文件处理，parse_many() 使用线程池并发处理多个文件；
+异步接口 parse_async() / parse_many_async() 可在单个事件循环中并发处理多个文件
+（由 concurrency 参数控制并发数）。
+
 输出模式：
   - 默认模式（return_layout_info=False）：parse() 返回纯 Markdown 字符串，不含任何图片 Base64
   - 富结果模式（return_layout_info=True）：parse() 返回 PaddleOCRVLResult，
@@ -16,17 +20,44 @@
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import copy
+import hashlib
+import json
 import logging
+import mmap
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from .exceptions import ConfigurationError, FileProcessingError
+from .exceptions import (
+    APIError,
+    ConfigurationError,
+    FileProcessingError,
+    RateLimitError,
+)
 from .basic_utils import RateLimiter, APIRequester, BaseConfig
 from .basic_utils.basic_logger import setup_file_logger
 
+try:
+    from pybase64 import b64encode
+except ImportError:  # 可选的 SIMD 加速，安装方式：pip install multi-ocr-sdk[fast]
+    from base64 import b64encode  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 # 支持的图片后缀
@@ -34,13 +65,26 @@ _IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp"}
 # fileType 常量（PaddleOCR 服务 API 约定：0=PDF，1=图像）
 _FILE_TYPE_PDF = 0
 _FILE_TYPE_IMAGE = 1
+# 后缀 -> fileType 映射，一次字典查找完成类型判断
+_EXT_TO_FILE_TYPE = {
+    ".pdf": _FILE_TYPE_PDF,
+    **dict.fromkeys(_IMAGE_EXTENSIONS, _FILE_TYPE_IMAGE),
+}
+# 流式 Base64 编码的分块大小，必须是 3 的倍数，保证只有最后一块会产生 "=" 填充
+_BASE64_CHUNK_SIZE = 3 * 262144
+# 文件上传方式
+_UPLOAD_MODES = ("base64", "multipart")
+# 匹配 Markdown 中嵌入 Base64 data-URI 的图片，模块加载时预编译一次
+_DATA_URI_IMG_RE = re.compile(r"!\[([^\]]*)\]\(data:[^)]+\)")
+# stream_responses 模式下从 /restructure-pages 响应中逐个取出的字段（ijson 前缀语法）
+_RESTRUCTURE_TEXT_PREFIX = "result.layoutParsingResults.item.markdown.text"
 
 
 # ---------------------------------------------------------------------------
 # 富结果数据类（当 return_layout_info=True 时使用）
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class PageLayoutInfo:
     """单页版面解析信息，包含边界框坐标等结构化数据。
 
@@ -52,7 +96,12 @@ class PageLayoutInfo:
     pruned_result: Dict[str, Any]
 
 
-@dataclass
+# 版面解析阶段的产物：(供 /restructure-pages 使用的 pages, 每页版面信息,
+# 仅有一页时该页的 Markdown 文本（否则为 None）)
+_LayoutPages = Tuple[List[Dict[str, Any]], List[PageLayoutInfo], Optional[str]]
+
+
+@dataclass(slots=True)
 class PaddleOCRVLResult:
     """PaddleOCR-VL 富解析结果，同时包含 Markdown 文本与版面定位信息。
 
@@ -97,7 +146,55 @@ class PaddleOCRVLConfig(BaseConfig):
         visualize:           传递给 /layout-parsing 接口的 visualize 参数。
                              默认为 False，服务端不返回可视化图像，输出结果中不含
                              Base64 图片数据。设为 True 时服务端会执行可视化渲染
-                             （但渲染结果不会出现在 SDK 返回值中）。
+                             （但渲染结果不会出现在 SDK 返回值中）。若服务端以
+                             400/422 拒绝携带 visualize=False 的请求，则去掉该参数
+                             重试一次；仅当重试成功（确认是服务端不支持该参数）时，
+                             之后的请求才不再携带。
+        upload_mode:         文件上传方式。"base64"（默认）：文件经 Base64 编码后
+                             放入 JSON 请求体，兼容官方服务化部署；"multipart"：
+                             以 multipart/form-data 直接上传原始字节，省去编码开销
+                             与约 33% 的体积膨胀，需服务端支持文件上传；若服务端
+                             返回 415，则自动回退为 Base64 JSON 上传。
+        keep_markdown_images: 是否将 /layout-parsing 返回的 markdownImages 图片数据
+                             原样回传给 /restructure-pages。默认 False：SDK 最终会
+                             剥除 Markdown 中的 Base64 图片，因此仅回传空占位，
+                             大幅减小第二次请求的体积；若服务端要求完整图片数据，
+                             可设为 True。visualize=True 时始终回传完整数据。
+        layout_cache_size:   版面解析结果的内存缓存容量（按文件内容 SHA-256 区分，
+                             LRU 淘汰），默认 0 即不缓存。设为正数后，同一文件再次
+                             解析（如更换 concatenate_pages，或 /restructure-pages
+                             失败后重试）时跳过耗时的 /layout-parsing 调用；代价是
+                             每次解析都要计算整个文件的摘要，并在存入与命中时深拷贝
+                             版面结果，文件不会重复时不建议开启。
+        http2:               异步接口是否改用 httpx 的 HTTP/2 传输（默认 False）。
+                             服务端或代理支持 HTTP/2 时，parse_many_async() 的并发
+                             请求可复用同一条连接多路传输。HTTP/2 只在 TLS 连接上
+                             协商（ALPN），base_url 为 http:// 时实际仍使用
+                             HTTP/1.1，不会多路复用。需安装可选依赖：
+                             pip install multi-ocr-sdk[http2]
+        max_concurrency:     并发解析的默认上限（默认 8）。既是 parse_many() /
+                             parse_many_async() 未指定 concurrency 时的取值，也限制
+                             同一客户端上同时执行的 parse_async() 调用数。连接池
+                             容量（同步会话、异步连接器与 HTTP/2 客户端的连接上限）
+                             随之设为
+                             max(32, 2 × max_concurrency)。
+        compress_requests:   是否对 JSON 请求体做 gzip 压缩（附带
+                             Content-Encoding: gzip，默认 False）。Base64 文本压缩后
+                             可减少约四分之一的上传字节，适合慢速链路；需服务端
+                             （或其前置代理）支持解压请求体，官方服务化部署默认不支持。
+        skip_single_page_restructure: 版面解析只返回一页且已带有 Markdown 文本时，
+                             是否跳过 /restructure-pages 直接使用该文本（默认 True）。
+                             单页无需合并，可省去一次 HTTP 往返；若依赖服务端重组
+                             阶段的额外处理，可设为 False。
+        max_retry_delay:     被限流后单次重试等待时间的上限（秒，默认 30）。等待时间按
+                             rate_limit_retry_delay 指数增长并加随机抖动，服务端返回
+                             Retry-After 时按其数值等待。服务端要求等待的时间超过该
+                             上限时不再重试，直接抛出 RateLimitError。
+        stream_responses:    是否边接收边解析 /restructure-pages 的响应（默认 False）。
+                             开启后用 ijson 增量解析，只取出各页的 Markdown 文本，
+                             不在内存中同时保留完整响应体与解析后的 JSON，适合超长
+                             文档。需安装可选依赖：pip install multi-ocr-sdk[stream]；
+                             http2=True 时异步接口仍整体解析。
     """
 
     # PaddleOCR 处理大文件耗时较长，覆盖 BaseConfig 的 60s 默认值
@@ -105,10 +202,35 @@ class PaddleOCRVLConfig(BaseConfig):
     enable_log: bool = False
     return_layout_info: bool = False
     visualize: Optional[bool] = False
+    upload_mode: Literal["base64", "multipart"] = "base64"
+    keep_markdown_images: bool = False
+    layout_cache_size: int = 0
+    http2: bool = False
+    max_concurrency: int = 8
+    compress_requests: bool = False
+    skip_single_page_restructure: bool = True
+    max_retry_delay: float = 30.0
+    stream_responses: bool = False
 
     def __post_init__(self) -> None:
         # 复用 BaseConfig 的通用校验（api_key、base_url、timeout、限流参数）
         super().__post_init__()
+        if self.upload_mode not in _UPLOAD_MODES:
+            raise ConfigurationError(
+                f"upload_mode must be one of {_UPLOAD_MODES}. Got: {self.upload_mode}"
+            )
+        if self.max_retry_delay <= 0:
+            raise ConfigurationError(
+                f"max_retry_delay must be positive. Got: {self.max_retry_delay}"
+            )
+        if self.max_concurrency < 1:
+            raise ConfigurationError(
+                f"max_concurrency must be at least 1. Got: {self.max_concurrency}"
+            )
+        if self.layout_cache_size < 0:
+            raise ConfigurationError(
+                f"layout_cache_size must be non-negative. Got: {self.layout_cache_size}"
+            )
         # 去除 base_url 末尾斜杠，统一格式
         self.base_url = self.base_url.rstrip("/")
 
@@ -139,6 +261,19 @@ class PaddleOCRVLClient:
             print(f"Page {i}: bboxes =", page.pruned_result)
         # 输出完整 JSON（包含文本及边界框，不含 Base64）
         import json; print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+
+    客户端内部复用同一个 HTTP 会话（keep-alive 连接池），可作为上下文管理器使用，
+    退出时自动关闭连接：
+        with PaddleOCRVLClient(
+            api_key="your_key", base_url="http://localhost:8080"
+        ) as client:
+            markdown_text = client.parse("./document.pdf")
+
+    使用示例（异步并发解析多个文件）：
+        async with PaddleOCRVLClient(
+            api_key="your_key", base_url="http://localhost:8080"
+        ) as client:
+            results = await client.parse_many_async(["a.pdf", "b.pdf"], concurrency=8)
     """
 
     def __init__(
@@ -153,6 +288,18 @@ class PaddleOCRVLClient:
         enable_log: bool = False,
         return_layout_info: bool = False,
         visualize: Optional[bool] = False,
+        upload_mode: Literal["base64", "multipart"] = "base64",
+        keep_markdown_images: bool = False,
+        layout_cache_size: int = 0,
+        http2: bool = False,
+        max_concurrency: int = 8,
+        compress_requests: bool = False,
+        skip_single_page_restructure: bool = True,
+        max_retry_delay: float = 30.0,
+        stream_responses: bool = False,
+        # 同步接口被限流后用于退避等待的函数，默认 time.sleep；批量任务中可传入
+        # 可被中断的等待（如 threading.Event().wait），以便随时停止退避中的线程
+        retry_sleep: Optional[Callable[[float], None]] = None,
     ) -> None:
         self.config = PaddleOCRVLConfig(
             api_key=api_key,
@@ -165,23 +312,102 @@ class PaddleOCRVLClient:
             enable_log=enable_log,
             return_layout_info=return_layout_info,
             visualize=visualize,
+            upload_mode=upload_mode,
+            keep_markdown_images=keep_markdown_images,
+            layout_cache_size=layout_cache_size,
+            http2=http2,
+            max_concurrency=max_concurrency,
+            compress_requests=compress_requests,
+            skip_single_page_restructure=skip_single_page_restructure,
+            max_retry_delay=max_retry_delay,
+            stream_responses=stream_responses,
         )
 
         if self.config.enable_log:
             log_file = setup_file_logger()
             logger.info(f"Logging enabled. Writing logs to {log_file}")
 
+        if self.config.http2 and self.config.base_url.startswith("http://"):
+            logger.warning(
+                "http2=True has no effect on plain http:// URLs: HTTP/2 is only "
+                "negotiated over TLS, so requests fall back to HTTP/1.1"
+            )
+
+        # 接口地址固定不变，构造时拼接一次（base_url 已在配置中去除末尾斜杠）
+        self._layout_url = f"{self.config.base_url}/layout-parsing"
+        self._restructure_url = f"{self.config.base_url}/restructure-pages"
+        # multipart 上传被服务端拒绝（415）后自动切换为 Base64 JSON
+        self._use_multipart = self.config.upload_mode == "multipart"
+        # 服务端不认识 visualize 参数而拒绝请求后，不再发送该参数
+        self._send_visualize = self.config.visualize is not None
+        # 请求头同样固定，构造时生成一次。本地部署无需鉴权，云端部署需要 api_key；
+        # APIRequester 发送前会复制该字典，各请求之间不会互相影响
+        self._headers: Dict[str, str] = {"Content-Type": "application/json"}
+        if self.config.api_key:
+            self._headers["Authorization"] = f"Bearer {self.config.api_key}"
+
         self._rate_limiter = RateLimiter(
             request_delay=self.config.request_delay,
             max_retries=self.config.max_rate_limit_retries,
             retry_delay=self.config.rate_limit_retry_delay,
+            max_retry_delay=self.config.max_retry_delay,
+            retry_sleep=retry_sleep,
+        )
+        # 同一会话在两个接口之间复用 keep-alive 连接；parse_many() 的每个线程各占
+        # 一条连接，parse_many_async() 两个阶段合计最多有 2 × concurrency 个请求在途。
+        # 连接池容量（同时也是异步连接器的单主机连接上限）按 2 × max_concurrency
+        # 设置，避免请求排队等待连接或多出的连接用完即被丢弃
+        self._api_requester = APIRequester(
+            self._rate_limiter,
+            self.config.timeout,
+            pool_maxsize=max(32, 2 * self.config.max_concurrency),
+            http2=self.config.http2,
+            compress_requests=self.config.compress_requests,
+            stream_responses=self.config.stream_responses,
         )
-        self._api_requester = APIRequester(self._rate_limiter, self.config.timeout)
+
+        # 版面解析结果缓存：文件内容摘要 -> (pages, pages_layout_info)
+        self._layout_cache: OrderedDict[str, _LayoutPages] = OrderedDict()
+        self._layout_cache_lock = threading.Lock()
+
+        # 限制 parse_async() 并发数的信号量，与事件循环绑定，按需创建
+        self._parse_semaphore: Optional[asyncio.Semaphore] = None
+        self._parse_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __enter__(self) -> "PaddleOCRVLClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "PaddleOCRVLClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
 
     # ------------------------------------------------------------------
     # 公共接口
     # ------------------------------------------------------------------
 
+    def close(self) -> None:
+        """关闭底层 HTTP 会话，释放连接池中的 keep-alive 连接。"""
+        self._api_requester.close()
+
+    async def aclose(self) -> None:
+        """
+        关闭同步与异步 HTTP 会话；使用过异步接口时应调用此方法。
+
+        异步会话与事件循环绑定，必须在使用异步接口的同一事件循环中 await
+        （例如在 ``asyncio.run()`` 结束前），否则其连接无法关闭。
+        """
+        await self._api_requester.aclose()
+
+    def clear_layout_cache(self) -> None:
+        """清空版面解析结果缓存。"""
+        with self._layout_cache_lock:
+            self._layout_cache.clear()
+
     def parse(
         self,
         file_path: Union[str, Path],
@@ -211,55 +437,273 @@ class PaddleOCRVLClient:
             f"visualize={self.config.visualize}"
         )
 
-        # Step 1: 调用版面解析接口
-        layout_result = self._call_layout_parsing(file_path)
-
-        # 从响应中提取每页的解析结果（同时保留 outputImages，供富结果模式使用）
-        pages, pages_layout_info = self._extract_pages_from_layout_result(layout_result)
+        # Step 1: 调用版面解析接口（命中缓存时跳过），提取每页的解析结果
+        pages, pages_layout_info, page_markdown = self._parse_layout(file_path)
         logger.info(f"layout-parsing returned {len(pages)} page(s)")
 
-        # Step 2: 调用页面重组接口，合并多页并返回 Markdown
-        markdown_text = self._call_restructure_pages(pages, concatenate_pages)
+        # Step 2: 调用页面重组接口，合并多页并返回 Markdown（单页时可跳过）
+        markdown_text = self._single_page_markdown(page_markdown)
+        if markdown_text is None:
+            markdown_text = self._call_restructure_pages(pages, concatenate_pages)
         logger.info(f"Parsing complete. Markdown length: {len(markdown_text)} chars")
 
-        if self.config.return_layout_info:
-            return PaddleOCRVLResult(
-                markdown=markdown_text,
-                pages_layout=pages_layout_info,
+        return self._build_result(markdown_text, pages_layout_info)
+
+    def parse_many(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        concatenate_pages: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> List[Union[str, "PaddleOCRVLResult"]]:
+        """
+        parse_many_async() 的同步版本，使用线程池并发解析多个本地文件。
+
+        PaddleOCR-VL 的 /layout-parsing 接口一次只接受一个文件，无法把多个文件
+        打包进同一个请求；这里改为让 ``concurrency`` 个线程共享同一个
+        keep-alive 连接池，依次领取文件执行 parse()，多个文件的请求在已建立的
+        连接上交错进行，省去逐个串行等待的往返时间。
+
+        Args:
+            file_paths:        待解析的文件路径列表
+            concatenate_pages: 同 parse()
+            concurrency:       同时解析的文件数上限，默认取配置的 max_concurrency，
+                               应不超过服务端可并发处理的请求数
+
+        Returns:
+            与 file_paths 顺序一致的结果列表，每项与 parse() 的返回值相同。
+            任一文件解析失败时抛出该文件的异常（尚未开始的文件不再处理）。
+        """
+        paths = [Path(p) for p in file_paths]
+        if concurrency is None:
+            concurrency = self.config.max_concurrency
+        concurrency = max(1, min(concurrency, len(paths) or 1))
+        logger.info(
+            f"Parsing {len(paths)} file(s), concurrency={concurrency}, "
+            f"concatenate_pages={concatenate_pages}"
+        )
+        if concurrency == 1:
+            return [self.parse(path, concatenate_pages) for path in paths]
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self.parse, path, concatenate_pages) for path in paths
+            ]
+            try:
+                # 不按输入顺序逐个等待：任一文件失败立即返回，不必等前面的文件完成
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            # 取消尚未开始的文件；已在执行的 parse() 无法中断，退出 with 时等其结束
+            for future in pending:
+                future.cancel()
+            for future in futures:
+                error = future.exception() if future in done else None
+                if error is not None:
+                    raise error
+            return [future.result() for future in futures]
+
+    async def parse_async(
+        self,
+        file_path: Union[str, Path],
+        concatenate_pages: bool = True,
+    ) -> Union[str, "PaddleOCRVLResult"]:
+        """
+        parse() 的异步版本，参数与返回值完全一致。
+
+        两次 HTTP 请求通过共享的 aiohttp 会话发送，等待响应期间不阻塞事件循环，
+        便于与其他文件的解析任务并发执行。同一客户端上同时执行的 parse_async()
+        调用数不超过配置的 max_concurrency，超出的调用会排队等待。
+        """
+        file_path = Path(file_path)
+        async with self._get_parse_semaphore():
+            logger.info(
+                f"Parsing file (async): {file_path}, "
+                f"concatenate_pages={concatenate_pages}, "
+                f"return_layout_info={self.config.return_layout_info}, "
+                f"visualize={self.config.visualize}"
             )
-        return markdown_text
+
+            pages, pages_layout_info, page_markdown = await self._parse_layout_async(
+                file_path
+            )
+            logger.info(f"layout-parsing returned {len(pages)} page(s)")
+
+            markdown_text = self._single_page_markdown(page_markdown)
+            if markdown_text is None:
+                markdown_text = await self._call_restructure_pages_async(
+                    pages, concatenate_pages
+                )
+            logger.info(
+                f"Parsing complete. Markdown length: {len(markdown_text)} chars"
+            )
+
+        return self._build_result(markdown_text, pages_layout_info)
+
+    async def parse_many_async(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        concatenate_pages: bool = True,
+        concurrency: Optional[int] = None,
+    ) -> List[Union[str, "PaddleOCRVLResult"]]:
+        """
+        并发解析多个本地文件。
+
+        内部按两级流水线执行：``concurrency`` 个版面解析协程依次领取文件并调用
+        /layout-parsing，结果放入有界队列（容量为 2 × concurrency）；另有
+        ``concurrency`` 个页面重组协程从队列取出结果调用 /restructure-pages。
+        某个文件的 /restructure-pages 请求与后续文件的 /layout-parsing 请求
+        同时进行，队列容量限制了等待重组的中间结果占用的内存。
+
+        Args:
+            file_paths:        待解析的文件路径列表
+            concatenate_pages: 同 parse()
+            concurrency:       每个阶段同时在途的请求数上限，默认取配置的
+                               max_concurrency，应不超过服务端可并发处理的请求数。
+                               两个阶段共用连接池，单主机连接数上限为
+                               max(32, 2 × max_concurrency)；指定的值超过
+                               max_concurrency 时，实际并发可能受该上限限制
+
+        Returns:
+            与 file_paths 顺序一致的结果列表，每项与 parse() 的返回值相同。
+            任一文件解析失败时取消其余任务并抛出该文件的异常。
+        """
+        paths = [Path(p) for p in file_paths]
+        if concurrency is None:
+            concurrency = self.config.max_concurrency
+        concurrency = max(1, min(concurrency, len(paths) or 1))
+        logger.info(
+            f"Parsing {len(paths)} file(s) (async), concurrency={concurrency}, "
+            f"concatenate_pages={concatenate_pages}"
+        )
+
+        results: List[Union[str, PaddleOCRVLResult]] = [""] * len(paths)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+        # 所有版面解析协程共享同一个迭代器，各自领取下一个待处理文件
+        pending = iter(enumerate(paths))
+        # 尚未完成的版面解析协程数，最后一个完成的协程负责通知重组协程退出
+        layout_running = concurrency
+
+        async def _layout_worker() -> None:
+            nonlocal layout_running
+            for idx, path in pending:
+                layout = await self._parse_layout_async(path)
+                pages, pages_layout_info, page_markdown = layout
+                logger.info(f"layout-parsing returned {len(pages)} page(s) for {path}")
+                # 单页且已有 Markdown 时不必进入重组阶段
+                markdown_text = self._single_page_markdown(page_markdown)
+                if markdown_text is not None:
+                    results[idx] = self._build_result(markdown_text, pages_layout_info)
+                    continue
+                await queue.put((idx, pages, pages_layout_info))
+            layout_running -= 1
+            if layout_running == 0:
+                # 版面解析全部完成后，通知每个重组协程退出
+                for _ in range(concurrency):
+                    await queue.put(None)
+
+        async def _restructure_worker() -> None:
+            while (item := await queue.get()) is not None:
+                idx, pages, pages_layout_info = item
+                markdown_text = await self._call_restructure_pages_async(
+                    pages, concatenate_pages
+                )
+                results[idx] = self._build_result(markdown_text, pages_layout_info)
+
+        # 每个协程都是独立任务，出错时才能逐个取消，不会遗留仍在发请求的协程
+        tasks = [asyncio.create_task(_layout_worker()) for _ in range(concurrency)]
+        tasks += [
+            asyncio.create_task(_restructure_worker()) for _ in range(concurrency)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # 任一协程出错时，取消其余任务并等待其真正结束，
+            # 避免异常抛给调用方之后仍有协程继续请求或阻塞在队列上
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return results
 
     # ------------------------------------------------------------------
     # 私有方法
     # ------------------------------------------------------------------
 
-    def _build_headers(self) -> Dict[str, str]:
-        """构建请求头。本地部署无需鉴权，云端部署需要 api_key。"""
-        headers: Dict[str, str] = {"Content-Type": "application/json"}
-        if self.config.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api_key}"
-        return headers
+    def _get_parse_semaphore(self) -> asyncio.Semaphore:
+        """返回当前事件循环上的 parse_async() 并发信号量，必要时新建。"""
+        loop = asyncio.get_running_loop()
+        if self._parse_semaphore is None or self._parse_semaphore_loop is not loop:
+            self._parse_semaphore = asyncio.Semaphore(self.config.max_concurrency)
+            self._parse_semaphore_loop = loop
+        return self._parse_semaphore
+
+    def _build_result(
+        self,
+        markdown_text: str,
+        pages_layout_info: List["PageLayoutInfo"],
+    ) -> Union[str, "PaddleOCRVLResult"]:
+        """根据 return_layout_info 配置组装 parse() 的返回值。"""
+        if self.config.return_layout_info:
+            return PaddleOCRVLResult(
+                markdown=markdown_text,
+                pages_layout=pages_layout_info,
+            )
+        return markdown_text
 
     @staticmethod
-    def _read_file_as_base64(file_path: Path) -> str:
-        """读取本地文件并返回 Base64 编码字符串（ASCII）。"""
+    def _read_file_as_base64(file_path: Path) -> bytearray:
+        """
+        读取本地文件并返回 Base64 编码后的 ASCII 字节。
+        文件通过 mmap 映射，按块取 memoryview 切片逐块编码：数据直接来自内核页缓存，
+        不在用户态复制出原始文件内容；输出缓冲区按编码后长度一次分配，逐块写入，
+        避免 bytearray 反复扩容。结果保持为字节，不转换成 str，直接拼接进 JSON 请求体。
+        无法映射的文件（空文件、管道等）退回逐块 read()。
+        """
         try:
             with open(file_path, "rb") as f:
-                return base64.b64encode(f.read()).decode("ascii")
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    encoded = bytearray()
+                    while chunk := f.read(_BASE64_CHUNK_SIZE):
+                        encoded += b64encode(chunk)
+                    return encoded
+                size = len(mm)
+                encoded = bytearray(4 * ((size + 2) // 3))
+                pos = 0
+                with mm, memoryview(mm) as view:
+                    for start in range(0, size, _BASE64_CHUNK_SIZE):
+                        # 切片同样引用映射内存，须在关闭 mmap 前释放
+                        with view[start : start + _BASE64_CHUNK_SIZE] as block:
+                            part = b64encode(block)
+                        encoded[pos : pos + len(part)] = part
+                        pos += len(part)
+            return encoded
         except OSError as e:
             raise FileProcessingError(f"Failed to read file '{file_path}': {e}") from e
 
+    @staticmethod
+    async def _read_file_as_base64_async(file_path: Path) -> bytearray:
+        """
+        _read_file_as_base64 的异步版本。
+        磁盘读取与 Base64 编码在线程池中执行，避免阻塞事件循环，
+        使其他文件的网络请求可以同时进行。
+        """
+        return await asyncio.to_thread(
+            PaddleOCRVLClient._read_file_as_base64, file_path
+        )
+
     @staticmethod
     def _detect_file_type(file_path: Path) -> int:
         """
         根据文件后缀判断 fileType。
-        返回 1（图片）或 2（PDF）。
+        返回 0（PDF）或 1（图片）。
         """
         ext = file_path.suffix.lower()
-        if ext == ".pdf":
-            return _FILE_TYPE_PDF
-        if ext in _IMAGE_EXTENSIONS:
-            return _FILE_TYPE_IMAGE
+        file_type = _EXT_TO_FILE_TYPE.get(ext)
+        if file_type is not None:
+            return file_type
         # 未知格式默认作为图片处理
         logger.warning(
             f"Unknown file extension '{ext}', treating as image (fileType=1). "
@@ -267,10 +711,99 @@ class PaddleOCRVLClient:
         )
         return _FILE_TYPE_IMAGE
 
-    def _call_layout_parsing(self, file_path: Path) -> Dict[str, Any]:
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        """
+        计算文件内容的 SHA-256 摘要，作为版面解析缓存的键。
+        与 _read_file_as_base64 一样通过 mmap 直接读取页缓存，不分配与文件等大的缓冲区；
+        缓存未命中时随后的编码读取也会命中页缓存。无法映射的文件退回逐块 read()。
+        """
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as f:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    while chunk := f.read(_BASE64_CHUNK_SIZE):
+                        digest.update(chunk)
+                    return digest.hexdigest()
+                with mm:
+                    digest.update(mm)
+        except OSError as e:
+            raise FileProcessingError(f"Failed to read file '{file_path}': {e}") from e
+        return digest.hexdigest()
+
+    def _layout_cache_key(self, file_path: Path) -> Optional[str]:
+        """
+        返回文件对应的缓存键；缓存关闭时返回 None（不计算摘要）。
+        visualize 不同时服务端响应不同，需区分。
+        """
+        if self.config.layout_cache_size <= 0:
+            return None
+        return f"{self._hash_file(file_path)}:{self.config.visualize}"
+
+    def _get_cached_layout(self, key: Optional[str]) -> Optional[_LayoutPages]:
+        if key is None:
+            return None
+        with self._layout_cache_lock:
+            entry = self._layout_cache.get(key)
+            if entry is None:
+                return None
+            self._layout_cache.move_to_end(key)
+        logger.info("layout-parsing cache hit, skipping request")
+        # 返回深拷贝：页面字典、prunedResult 与 PageLayoutInfo 都不与调用方共享，
+        # 调用方修改解析结果不会影响之后的 parse() 结果和 /restructure-pages 请求
+        return copy.deepcopy(entry)
+
+    def _store_cached_layout(self, key: Optional[str], layout: _LayoutPages) -> None:
+        if key is None:
+            return
+        # 存入深拷贝，与即将返回给调用方的对象分离
+        entry = copy.deepcopy(layout)
+        with self._layout_cache_lock:
+            self._layout_cache[key] = entry
+            self._layout_cache.move_to_end(key)
+            while len(self._layout_cache) > self.config.layout_cache_size:
+                self._layout_cache.popitem(last=False)
+
+    def _parse_layout(self, file_path: Path) -> _LayoutPages:
+        """
+        调用 /layout-parsing（优先使用缓存）并提取每页结果。
+        先只计算文件摘要查找缓存，命中时不做 Base64 编码、不构建请求体。
+        """
+        key = self._layout_cache_key(file_path)
+        cached = self._get_cached_layout(key)
+        if cached is not None:
+            return cached
+        layout_result = self._call_layout_parsing(file_path)
+        layout = self._extract_pages_from_layout_result(layout_result)
+        self._store_cached_layout(key, layout)
+        return layout
+
+    async def _parse_layout_async(self, file_path: Path) -> _LayoutPages:
+        """
+        _parse_layout 的异步版本。
+        文件摘要与缓存条目的深拷贝在线程池中进行，多页结果较大时不阻塞事件循环；
+        缓存关闭时不做这些额外工作。
+        """
+        if self.config.layout_cache_size <= 0:
+            layout_result = await self._call_layout_parsing_async(file_path)
+            return self._extract_pages_from_layout_result(layout_result)
+        key = await asyncio.to_thread(self._layout_cache_key, file_path)
+        cached = await asyncio.to_thread(self._get_cached_layout, key)
+        if cached is not None:
+            return cached
+        layout_result = await self._call_layout_parsing_async(file_path)
+        layout = self._extract_pages_from_layout_result(layout_result)
+        await asyncio.to_thread(self._store_cached_layout, key, layout)
+        return layout
+
+    def _build_layout_body(
+        self, file_path: Path, file_data: bytearray, send_visualize: bool
+    ) -> bytes:
         """
         基于paddleocr-vl后端官方api
-        调用 /layout-parsing 接口，返回原始响应 JSON。
+        构建 /layout-parsing 接口的 JSON 请求体（已序列化的字节）。
 
         请求体格式：
             {
@@ -278,61 +811,230 @@ class PaddleOCRVLClient:
                 "fileType": 1,          # 0=PDF, 1=图片
                 "visualize": true       # 可选，true 时响应中包含 outputImages
             }
+
+        Base64 字母表中没有需要 JSON 转义的字符，因此编码结果直接按字节拼接进
+        请求体，不经过 str 和 JSON 序列化，省去一次完整复制与 UTF-8 编码。
+        send_visualize 为 False 时不携带 visualize 字段。
         """
-        file_data = self._read_file_as_base64(file_path)
         file_type = self._detect_file_type(file_path)
-        payload: Dict[str, Any] = {
-            "file": file_data,
-            "fileType": file_type,
-        }
+        fields: Dict[str, Any] = {"fileType": file_type}
         # 仅当用户显式设置时才传递 visualize，避免覆盖服务端默认行为
-        if self.config.visualize is not None:
-            payload["visualize"] = self.config.visualize
-        url = f"{self.config.base_url}/layout-parsing"
-        logger.debug(f"POST {url} (fileType={file_type}, visualize={self.config.visualize})")
+        if send_visualize:
+            fields["visualize"] = self.config.visualize
+        # 仅在开启 DEBUG 日志时才格式化日志字符串
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"POST {self._layout_url} "
+                f"(fileType={file_type}, visualize={self.config.visualize})"
+            )
+        # 去掉小字段 JSON 的左花括号，接在 "file" 字段之后
+        tail = json.dumps(fields).encode("ascii")[1:]
+        return b"".join((b'{"file": "', file_data, b'", ', tail))
+
+    def _build_layout_form_fields(
+        self, file_path: Path, send_visualize: bool
+    ) -> Dict[str, str]:
+        """构建 multipart 上传模式下随文件一同发送的表单字段。"""
+        file_type = self._detect_file_type(file_path)
+        fields = {"fileType": str(file_type)}
+        if send_visualize:
+            fields["visualize"] = "true" if self.config.visualize else "false"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"POST {self._layout_url} (multipart, "
+                f"fileType={file_type}, visualize={self.config.visualize})"
+            )
+        return fields
+
+    def _disable_multipart_on_415(self, error: APIError) -> None:
+        """
+        multipart 上传被服务端以 415（Unsupported Media Type）拒绝时，
+        记录警告并在本客户端后续请求中改用 Base64 JSON 上传；其他错误原样抛出。
+        """
+        if error.status_code != 415:
+            raise error
+        logger.warning(
+            "Server rejected multipart upload (415), falling back to base64 JSON"
+        )
+        self._use_multipart = False
+
+    def _may_have_rejected_visualize(self, error: APIError) -> bool:
+        """
+        visualize=False 用于提示服务端不要渲染并回传可视化图像（outputImages），
+        省去大量下载数据。请求以 400/422 失败时，可能是服务端不支持该参数，
+        也可能只是文件本身有问题；返回 True 表示应去掉该参数重试一次，
+        由重试结果判断是哪一种（见 _call_layout_parsing）。
+        显式要求 visualize=True 时不做降级，错误原样交由调用方处理；
+        被限流（RateLimitError）时同样不做降级，已由 APIRequester 退避重试过。
+        """
+        if (
+            isinstance(error, RateLimitError)
+            or error.status_code not in (400, 422)
+            or not self._send_visualize
+            or self.config.visualize
+        ):
+            return False
+        logger.warning(
+            f"layout-parsing failed ({error.status_code}), "
+            "retrying without the visualize parameter"
+        )
+        return True
+
+    def _stop_sending_visualize(self) -> None:
+        """去掉 visualize 后请求成功，确认服务端不支持该参数，之后的请求不再携带。"""
+        if self._send_visualize:
+            logger.warning(
+                "Server does not accept the visualize parameter, no longer sending it"
+            )
+            self._send_visualize = False
+
+    def _call_layout_parsing(self, file_path: Path) -> Dict[str, Any]:
+        """调用 /layout-parsing 接口，返回原始响应 JSON。"""
+        try:
+            return self._send_layout_parsing(file_path)
+        except APIError as e:
+            if not self._may_have_rejected_visualize(e):
+                raise
+            error = e
+        try:
+            result = self._send_layout_parsing(file_path, send_visualize=False)
+        except APIError:
+            # 去掉参数仍失败，说明问题不在 visualize（如文件损坏），抛出原始错误
+            raise error
+        self._stop_sending_visualize()
+        return result
+
+    async def _call_layout_parsing_async(self, file_path: Path) -> Dict[str, Any]:
+        """_call_layout_parsing 的异步版本。"""
+        try:
+            return await self._send_layout_parsing_async(file_path)
+        except APIError as e:
+            if not self._may_have_rejected_visualize(e):
+                raise
+            error = e
+        try:
+            result = await self._send_layout_parsing_async(
+                file_path, send_visualize=False
+            )
+        except APIError:
+            raise error
+        self._stop_sending_visualize()
+        return result
+
+    def _send_layout_parsing(
+        self, file_path: Path, send_visualize: bool = True
+    ) -> Dict[str, Any]:
+        """
+        按当前上传方式向 /layout-parsing 发送一次请求。
+        send_visualize=False 时本次请求不携带 visualize 参数。
+        """
+        send_visualize = send_visualize and self._send_visualize
+        if self._use_multipart:
+            try:
+                return self._api_requester.request_multipart_sync(
+                    url=self._layout_url,
+                    headers=self._headers,
+                    file_path=file_path,
+                    fields=self._build_layout_form_fields(file_path, send_visualize),
+                    enable_rate_limit_retry=self.config.enable_rate_limit_retry,
+                )
+            except APIError as e:
+                self._disable_multipart_on_415(e)
+        file_data = self._read_file_as_base64(file_path)
+        body = self._build_layout_body(file_path, file_data, send_visualize)
+        del file_data  # 请求体已包含编码数据，尽早释放
         return self._api_requester.request_sync(
-            url=url,
-            headers=self._build_headers(),
-            payload=payload,
+            url=self._layout_url,
+            headers=self._headers,
+            payload=body,
+            enable_rate_limit_retry=self.config.enable_rate_limit_retry,
+        )
+
+    async def _send_layout_parsing_async(
+        self, file_path: Path, send_visualize: bool = True
+    ) -> Dict[str, Any]:
+        """_send_layout_parsing 的异步版本。"""
+        send_visualize = send_visualize and self._send_visualize
+        if self._use_multipart:
+            try:
+                return await self._api_requester.request_multipart_async(
+                    url=self._layout_url,
+                    headers=self._headers,
+                    file_path=file_path,
+                    fields=self._build_layout_form_fields(file_path, send_visualize),
+                    enable_rate_limit_retry=self.config.enable_rate_limit_retry,
+                )
+            except APIError as e:
+                self._disable_multipart_on_415(e)
+        file_data = await self._read_file_as_base64_async(file_path)
+        body = self._build_layout_body(file_path, file_data, send_visualize)
+        del file_data  # 请求体已包含编码数据，尽早释放
+        return await self._api_requester.request_async(
+            url=self._layout_url,
+            headers=self._headers,
+            payload=body,
             enable_rate_limit_retry=self.config.enable_rate_limit_retry,
         )
 
-    @staticmethod
     def _extract_pages_from_layout_result(
+        self,
         layout_response: Dict[str, Any],
-    ) -> tuple[List[Dict[str, Any]], List["PageLayoutInfo"]]:
+    ) -> _LayoutPages:
         """
-        从 /layout-parsing 响应中提取数据，同时返回两类信息：
+        从 /layout-parsing 响应中提取数据，返回三类信息：
 
         1. ``pages``：供 /restructure-pages 接口使用的页面列表，每项包含
            ``prunedResult`` 和 ``markdownImages``（图片 Base64 数据）。
         2. ``pages_layout_info``：:class:`PageLayoutInfo` 列表，每项包含
            ``pruned_result``（边界框等结构化数据）和 ``output_image``
            （当 visualize=True 时由服务端返回的标注可视化图像，否则为 None）。
+        3. ``page_markdown``：响应只有一页时该页的 Markdown 文本，供跳过
+           /restructure-pages 使用；多页或文本为空时为 None。
 
-        注：markdownImages 仍传给 /restructure-pages（服务端构建 Markdown 所需），
-        但最终 Markdown 文本中的 Base64 data-URI 图片会在返回前被剥除。
+        注：最终 Markdown 文本中的 Base64 data-URI 图片会在返回前被剥除，因此
+        除非配置了 visualize=True 或 keep_markdown_images=True，markdownImages
+        中的每张图片都会被替换为空字符串占位（保留图片路径键，服务端仍能生成
+        图片引用），避免把数 MB 的 Base64 数据原样回传给 /restructure-pages。
         """
+        strip_images = not (self.config.visualize or self.config.keep_markdown_images)
         layout_parsing_results: List[Dict[str, Any]] = (
             layout_response.get("result", {}).get("layoutParsingResults", [])
         )
-        pages: List[Dict[str, Any]] = []
-        pages_layout_info: List[PageLayoutInfo] = []
-        for res in layout_parsing_results:
-            pruned_result = res.get("prunedResult", {})
-            markdown_images = res.get("markdown", {}).get("images")
-            pages.append(
-                {
-                    "prunedResult": pruned_result,
-                    "markdownImages": markdown_images,
-                }
-            )
-            pages_layout_info.append(
-                PageLayoutInfo(
-                    pruned_result=pruned_result,
-                )
-            )
-        return pages, pages_layout_info
+        # 预分配结果列表并按下标赋值，避免多页 PDF 时 append 反复扩容；
+        # pruned_result 在两个列表间共享同一对象（后续流程不会修改它）。
+        # 逐页取字段时不用 .get(key, {})：默认值参数每次调用都会新建一个空字典
+        n = len(layout_parsing_results)
+        pages: List[Dict[str, Any]] = [None] * n  # type: ignore[list-item]
+        pages_layout_info: List[PageLayoutInfo] = [None] * n  # type: ignore[list-item]
+        for i, res in enumerate(layout_parsing_results):
+            pruned_result = res.get("prunedResult")
+            if pruned_result is None:
+                pruned_result = {}
+            markdown = res.get("markdown")
+            markdown_images = markdown.get("images") if markdown else None
+            if strip_images and markdown_images:
+                markdown_images = dict.fromkeys(markdown_images, "")
+            pages[i] = {
+                "prunedResult": pruned_result,
+                "markdownImages": markdown_images,
+            }
+            pages_layout_info[i] = PageLayoutInfo(pruned_result=pruned_result)
+
+        page_markdown: Optional[str] = None
+        if n == 1:
+            markdown = layout_parsing_results[0].get("markdown")
+            page_markdown = (markdown.get("text") if markdown else None) or None
+        return pages, pages_layout_info, page_markdown
+
+    def _single_page_markdown(self, page_markdown: Optional[str]) -> Optional[str]:
+        """
+        单页且版面解析已给出 Markdown 文本时，直接返回该文本（剥除 Base64 图片），
+        跳过 /restructure-pages；否则返回 None，由调用方继续调用重组接口。
+        """
+        if page_markdown is None or not self.config.skip_single_page_restructure:
+            return None
+        logger.info("Single page with markdown text, skipping restructure-pages")
+        return _strip_data_uri_images(page_markdown)
 
     def _call_restructure_pages(
         self,
@@ -355,38 +1057,92 @@ class PaddleOCRVLClient:
             "pages": pages,
             "concatenatePages": concatenate_pages,
         }
-        url = f"{self.config.base_url}/restructure-pages"
-        logger.debug(f"POST {url} (concatenatePages={concatenate_pages})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"POST {self._restructure_url} (concatenatePages={concatenate_pages})"
+            )
+        if self.config.stream_responses:
+            texts = self._api_requester.request_sync_items(
+                url=self._restructure_url,
+                headers=self._headers,
+                payload=payload,
+                prefix=_RESTRUCTURE_TEXT_PREFIX,
+                enable_rate_limit_retry=self.config.enable_rate_limit_retry,
+            )
+            return self._join_markdown_texts(texts)
         response = self._api_requester.request_sync(
-            url=url,
-            headers=self._build_headers(),
+            url=self._restructure_url,
+            headers=self._headers,
             payload=payload,
             enable_rate_limit_retry=self.config.enable_rate_limit_retry,
         )
+        return self._extract_markdown_from_restructure_result(response)
 
+    async def _call_restructure_pages_async(
+        self,
+        pages: List[Dict[str, Any]],
+        concatenate_pages: bool,
+    ) -> str:
+        """_call_restructure_pages 的异步版本。"""
+        payload: Dict[str, Any] = {
+            "pages": pages,
+            "concatenatePages": concatenate_pages,
+        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"POST {self._restructure_url} (concatenatePages={concatenate_pages})"
+            )
+        if self.config.stream_responses:
+            texts = await self._api_requester.request_async_items(
+                url=self._restructure_url,
+                headers=self._headers,
+                payload=payload,
+                prefix=_RESTRUCTURE_TEXT_PREFIX,
+                enable_rate_limit_retry=self.config.enable_rate_limit_retry,
+            )
+            return self._join_markdown_texts(texts)
+        response = await self._api_requester.request_async(
+            url=self._restructure_url,
+            headers=self._headers,
+            payload=payload,
+            enable_rate_limit_retry=self.config.enable_rate_limit_retry,
+        )
+        return self._extract_markdown_from_restructure_result(response)
+
+    @staticmethod
+    def _extract_markdown_from_restructure_result(response: Dict[str, Any]) -> str:
+        """从 /restructure-pages 响应中提取 Markdown 文本，并剥除 Base64 图片。"""
         # 提取 Markdown 文本
         layout_parsing_results: List[Dict[str, Any]] = (
             response.get("result", {}).get("layoutParsingResults", [])
         )
-        if not layout_parsing_results:
+        return PaddleOCRVLClient._join_markdown_texts(
+            [res.get("markdown", {}).get("text", "") for res in layout_parsing_results]
+        )
+
+    @staticmethod
+    def _join_markdown_texts(texts: List[Optional[str]]) -> str:
+        """拼接各条目的 Markdown 文本，并剥除 Base64 图片。"""
+        if not texts:
             logger.warning("restructure-pages returned empty layoutParsingResults")
             return ""
 
-        # concatenatePages=True 时只有一个条目；False 时有多个条目
-        markdown_parts = []
-        for res in layout_parsing_results:
-            text = res.get("markdown", {}).get("text", "")
-            if text:
-                markdown_parts.append(text)
-
-        markdown = "\n\n---\n\n".join(markdown_parts)
-        # 剥除 Markdown 中嵌入的 Base64 data-URI 图片，替换为空的占位符
-        markdown = re.sub(
-            r'!\[([^\]]*)\]\(data:[^)]+\)',
-            r'![\1]()',
-            markdown,
-        )
-        return markdown
+        # concatenatePages=True 时只有一个条目，直接取其文本，无需再 join；
+        # False 时有多个条目，用分隔符拼接
+        if len(texts) == 1:
+            return _strip_data_uri_images(texts[0] or "")
+
+        markdown = "\n\n---\n\n".join(text for text in texts if text)
+        return _strip_data_uri_images(markdown)
+
+
+def _strip_data_uri_images(markdown: str) -> str:
+    """剥除 Markdown 中嵌入的 Base64 data-URI 图片，替换为空的占位符。"""
+    # 先用 in 做一次 C 层面的子串查找，不含 data-URI 时直接跳过正则扫描
+    # （CPython 的 re 匹配期间不释放 GIL，多线程分段处理并不能提速）
+    if "data:" in markdown:
+        markdown = _DATA_URI_IMG_RE.sub(r"![\1]()", markdown)
+    return markdown
 
 
 __all__ = ["PaddleOCRVLClient", "PaddleOCRVLConfig", "PaddleOCRVLResult", "PageLayoutInfo"]
@@ -8,7 +8,7 @@ import os
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .exceptions import (
@@ -113,6 +113,8 @@ class VLMClient:
         temperature: Optional[float] = None,
         request_delay: Optional[float] = None,
         enable_log: Optional[bool] = None,
+        # 同步请求被限流后用于退避等待的函数，默认 time.sleep
+        retry_sleep: Optional[Callable[[float], None]] = None,
         **overrides: Any,
     ) -> None:
         # 设置client要使用的变量
@@ -143,12 +145,28 @@ class VLMClient:
             request_delay=self.config.request_delay,
             max_retries=self.config.max_rate_limit_retries,
             retry_delay=self.config.rate_limit_retry_delay,
+            retry_sleep=retry_sleep,
         )
         self._api_requester = APIRequester(self._rate_limiter, self.config.timeout)
+        # api_key 在 client 生命周期内不变，请求头构造时生成一次，每次请求直接复用
+        self._headers = {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Content-Type": "application/json",
+        }
 
         # 初始化 Chat API（用于发送消息和接收回复）
         self.chat = _ChatAPI(self)
 
+    def __enter__(self) -> "VLMClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # 关闭底层 HTTP 会话，释放连接池中的 keep-alive 连接
+        self._api_requester.close()
+
     def _process_single_page(
         self,
         image_b64: str,
@@ -281,11 +299,7 @@ class VLMClient:
 
 
     def _make_api_request_sync(self, model: str, messages: List[Dict[str, Any]], timeout: Optional[int] = None, **kwargs: Any) -> Dict[str, Any]:
-        # 构建请求头（包含apikey）和请求体（包含模型名称、消息内容等）
-        headers = {
-            "Authorization": f"Bearer {self.config.api_key}",
-            "Content-Type": "application/json",
-        }
+        # 构建请求体（包含模型名称、消息内容等），请求头已在 __init__ 中生成
         payload = {
             "model": model or self.config.model,
             "messages": messages,
@@ -295,7 +309,7 @@ class VLMClient:
 
         return self._api_requester.request_sync(
             self.config.base_url,
-            headers,
+            self._headers,
             payload,
             enable_rate_limit_retry=self.config.enable_rate_limit_retry,
             timeout_override=timeout,
@@ -0,0 +1,94 @@
+"""
+Tests for the APIRequester transport layer.
+"""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from multi_ocr_sdk.basic_utils import APIRequester, RateLimiter
+from multi_ocr_sdk.exceptions import APIError, ConfigurationError, TimeoutError
+
+
+@pytest.mark.asyncio
+async def test_async_request_compresses_body_off_the_event_loop():
+    """gzip compression of async request bodies must not block the event loop."""
+    bodies = []
+
+    async def handler(request):
+        assert request.headers["Content-Encoding"] == "gzip"
+        # aiohttp undoes the Content-Encoding before the handler reads the body
+        bodies.append(await request.json())
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    requester = APIRequester(RateLimiter(), timeout=10, compress_requests=True)
+    compress_threads = []
+    real_compress = gzip.compress
+
+    def tracking_compress(data, compresslevel):
+        compress_threads.append(threading.current_thread())
+        return real_compress(data, compresslevel=compresslevel)
+
+    try:
+        with patch("gzip.compress", side_effect=tracking_compress):
+            result = await requester.request_async(
+                str(server.make_url("/")), {}, {"file": "AAAA"}
+            )
+    finally:
+        await requester.aclose()
+        await server.close()
+
+    assert result == {"ok": True}
+    assert bodies == [{"file": "AAAA"}]
+    assert compress_threads and threading.main_thread() not in compress_threads
+
+
+def test_http2_without_h2_is_rejected_at_construction():
+    """httpx installed without h2 must fail early with a ConfigurationError."""
+    pytest.importorskip("httpx")
+    with patch("importlib.util.find_spec", return_value=None):
+        with pytest.raises(ConfigurationError, match=r"multi-ocr-sdk\[http2\]"):
+            APIRequester(RateLimiter(), timeout=10, http2=True)
+
+
+@pytest.mark.parametrize("stall", [True, False])
+def test_streamed_response_errors_are_mapped(stall):
+    """A body that stalls or breaks off mid-stream should raise SDK exceptions."""
+    pytest.importorskip("ijson")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            self.wfile.write(b'{"items": [1, 2,')
+            self.wfile.flush()
+            if stall:
+                time.sleep(2)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    requester = APIRequester(RateLimiter(), timeout=1, stream_responses=True)
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        expected = TimeoutError if stall else APIError
+        with pytest.raises(expected):
+            requester.request_sync_items(url, {}, {}, "items.item")
+    finally:
+        requester.close()
+        server.shutdown()
+        server.server_close()
@@ -305,3 +305,11 @@ def test_parse_with_fallback(mock_pdf):
                 assert mock_api.call_count == 2
                 # Should return long fallback result
                 assert len(result) > 500
+
+
+def test_context_manager_closes_session():
+    """Leaving the with-block should close the underlying session."""
+    with patch("requests.Session.close") as mock_close:
+        with DeepSeekOCR(api_key="test_key", base_url="http://test.com"):
+            pass
+    mock_close.assert_called_once()
@@ -0,0 +1,21 @@
+"""
+Tests for file processing utilities.
+"""
+
+import base64
+from unittest.mock import patch
+
+from multi_ocr_sdk.basic_utils import FileProcessor
+
+
+def test_stream_file_to_base64_matches_stdlib(tmp_path):
+    """Chunked encoding must produce exactly the same output as a one-shot encode."""
+    # Not a multiple of the chunk size, so the last chunk is short and padded
+    data = bytes(range(256)) * 50 + b"odd tail"
+    path = tmp_path / "image.png"
+    path.write_bytes(data)
+
+    with patch("multi_ocr_sdk.basic_utils.file_processor._BASE64_CHUNK_SIZE", 3 * 1024):
+        encoded = FileProcessor._stream_file_to_base64(path)
+
+    assert encoded == base64.b64encode(data).decode("ascii")
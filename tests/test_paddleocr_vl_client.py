@@ -0,0 +1,803 @@
+"""
+Tests for PaddleOCR-VL client.
+"""
+
+import asyncio
+import base64
+import gzip
+import io
+import json
+import logging
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from multi_ocr_sdk import PaddleOCRVLClient
+from multi_ocr_sdk.exceptions import APIError, ConfigurationError
+from multi_ocr_sdk.exceptions import TimeoutError as SDKTimeoutError
+
+
+@pytest.fixture
+def client():
+    """Create a test client pointing at a dummy server."""
+    return PaddleOCRVLClient(api_key="test_key", base_url="http://test.com/")
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    """Create a small image-like file on disk."""
+    path = tmp_path / "page.png"
+    path.write_bytes(b"fake image bytes")
+    return path
+
+
+@pytest.fixture
+def make_files(tmp_path):
+    """Return a factory writing ``count`` small files whose content names them."""
+
+    def make(count, width=1):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"page{i:0{width}d}.png"
+            path.write_bytes(f"image {i:0{width}d}".encode())
+            paths.append(path)
+        return paths
+
+    return make
+
+
+def _mock_response(payload=None, status_code=200, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    if payload is not None:
+        response.content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+LAYOUT_RESPONSE = {
+    "result": {
+        "layoutParsingResults": [
+            {
+                "prunedResult": {"boxes": [1, 2, 3, 4]},
+                "markdown": {"images": {"imgs/a.png": "AAAA"}},
+            }
+        ]
+    }
+}
+
+RESTRUCTURE_RESPONSE = {
+    "result": {
+        "layoutParsingResults": [
+            {"markdown": {"text": "# Title\n\n![fig](data:image/png;base64,AAAA)"}}
+        ]
+    }
+}
+
+
+def test_parse_reuses_session(client, image_file):
+    """Both endpoints should be called through the same pooled session."""
+    session = client._api_requester._session
+    with patch.object(
+        session,
+        "post",
+        side_effect=[
+            _mock_response(LAYOUT_RESPONSE),
+            _mock_response(RESTRUCTURE_RESPONSE),
+        ],
+    ) as mock_post:
+        markdown = client.parse(image_file)
+
+    assert markdown == "# Title\n\n![fig]()"
+    assert mock_post.call_count == 2
+    urls = [call.args[0] for call in mock_post.call_args_list]
+    assert urls == [
+        "http://test.com/layout-parsing",
+        "http://test.com/restructure-pages",
+    ]
+    layout_kwargs = mock_post.call_args_list[0].kwargs
+    assert layout_kwargs["headers"]["Content-Type"] == "application/json"
+    assert json.loads(layout_kwargs["data"]) == {
+        "file": base64.b64encode(b"fake image bytes").decode("ascii"),
+        "fileType": 1,
+        "visualize": False,
+    }
+
+
+def test_context_manager_closes_session():
+    """Leaving the with-block should close the underlying session."""
+    with patch("requests.Session.close") as mock_close:
+        with PaddleOCRVLClient(api_key="test_key", base_url="http://test.com"):
+            pass
+    mock_close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_parse_many_async_preserves_order_and_bounds_concurrency(
+    client, make_files
+):
+    """parse_many_async should keep input order and cap in-flight requests."""
+    paths = make_files(5)
+
+    in_flight = {"layout": 0, "restructure": 0}
+    max_in_flight = {"layout": 0, "restructure": 0}
+
+    async def fake_request_async(url, headers, payload, **kwargs):
+        stage = "layout" if url.endswith("/layout-parsing") else "restructure"
+        if stage == "layout":
+            name = base64.b64decode(json.loads(payload)["file"]).decode()
+        else:
+            name = payload["pages"][0]["prunedResult"]["name"]
+
+        in_flight[stage] += 1
+        max_in_flight[stage] = max(max_in_flight[stage], in_flight[stage])
+        # Later files respond faster to exercise out-of-order completion
+        await asyncio.sleep(0.01 * (5 - int(name[-1])))
+        in_flight[stage] -= 1
+
+        if stage == "layout":
+            return {
+                "result": {"layoutParsingResults": [{"prunedResult": {"name": name}}]}
+            }
+        return {"result": {"layoutParsingResults": [{"markdown": {"text": name}}]}}
+
+    with patch.object(
+        client._api_requester, "request_async", side_effect=fake_request_async
+    ):
+        results = await client.parse_many_async(paths, concurrency=2)
+
+    assert results == [f"image {i}" for i in range(5)]
+    assert max_in_flight["layout"] <= 2
+    assert max_in_flight["restructure"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_parse_many_async_propagates_errors(client, image_file):
+    """A failing file should raise instead of hanging the pipeline."""
+    with patch.object(
+        client._api_requester,
+        "request_async",
+        new=AsyncMock(side_effect=APIError("boom", status_code=500)),
+    ):
+        with pytest.raises(APIError):
+            await client.parse_many_async([image_file, image_file], concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_parse_many_async_stops_workers_after_single_failure(client, make_files):
+    """When one file fails, no other worker should keep sending requests."""
+    paths = make_files(20, width=2)
+
+    layout_calls = []
+
+    async def fake_request_async(url, headers, payload, **kwargs):
+        if url.endswith("/layout-parsing"):
+            name = base64.b64decode(json.loads(payload)["file"]).decode()
+            layout_calls.append(name)
+            if name == "image 03":
+                raise APIError("cannot decode file", status_code=500)
+            await asyncio.sleep(0.01)
+            return LAYOUT_RESPONSE
+        return RESTRUCTURE_RESPONSE
+
+    with patch.object(
+        client._api_requester, "request_async", side_effect=fake_request_async
+    ):
+        with pytest.raises(APIError):
+            await client.parse_many_async(paths, concurrency=2)
+        calls_at_failure = len(layout_calls)
+        await asyncio.sleep(0.05)
+
+    assert len(layout_calls) == calls_at_failure < len(paths)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_parse_async(client, image_file):
+    """parse_async should call both endpoints via the async requester."""
+    with patch.object(
+        client._api_requester,
+        "request_async",
+        new=AsyncMock(side_effect=[LAYOUT_RESPONSE, RESTRUCTURE_RESPONSE]),
+    ) as mock_request:
+        markdown = await client.parse_async(image_file)
+
+    assert markdown == "# Title\n\n![fig]()"
+    assert mock_request.await_count == 2
+
+
+def test_read_file_as_base64_matches_stdlib(tmp_path):
+    """Chunked encoding must produce exactly the same output as a one-shot encode."""
+    data = bytes(range(256)) * 5000 + b"tail"
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(data)
+
+    with patch("multi_ocr_sdk.paddleocr_vl_client._BASE64_CHUNK_SIZE", 3 * 1024):
+        encoded = PaddleOCRVLClient._read_file_as_base64(path)
+
+    assert encoded == base64.b64encode(data)
+
+
+def test_multipart_upload_mode(image_file):
+    """multipart mode should upload raw bytes as a form file, not base64 JSON."""
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", upload_mode="multipart"
+    )
+    uploads = []
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            name, fileobj, content_type = kwargs["files"]["file"]
+            uploads.append((name, fileobj.read(), content_type, kwargs["data"]))
+            assert "json" not in kwargs
+            assert "Content-Type" not in kwargs["headers"]
+            return _mock_response(LAYOUT_RESPONSE)
+        return _mock_response(RESTRUCTURE_RESPONSE)
+
+    with patch.object(client._api_requester._session, "post", side_effect=fake_post):
+        client.parse(image_file)
+
+    assert uploads == [
+        (
+            "page.png",
+            b"fake image bytes",
+            "image/png",
+            {"fileType": "1", "visualize": "false"},
+        )
+    ]
+
+
+def test_invalid_upload_mode():
+    """Unknown upload modes should be rejected at construction time."""
+    with pytest.raises(ConfigurationError):
+        PaddleOCRVLClient(
+            api_key="test_key", base_url="http://test.com", upload_mode="ftp"
+        )
+
+
+def test_markdown_images_not_sent_back_by_default(client):
+    """Image data should be replaced by placeholders unless explicitly kept."""
+    pages, _, _ = client._extract_pages_from_layout_result(LAYOUT_RESPONSE)
+    assert pages[0]["markdownImages"] == {"imgs/a.png": ""}
+
+    keep_client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", keep_markdown_images=True
+    )
+    pages, _, _ = keep_client._extract_pages_from_layout_result(LAYOUT_RESPONSE)
+    assert pages[0]["markdownImages"] == {"imgs/a.png": "AAAA"}
+
+
+def test_layout_cache_skips_repeat_layout_parsing(image_file):
+    """With the cache enabled, a repeat parse should skip /layout-parsing."""
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", layout_cache_size=16
+    )
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            return _mock_response(LAYOUT_RESPONSE)
+        return _mock_response(RESTRUCTURE_RESPONSE)
+
+    with patch.object(
+        client._api_requester._session, "post", side_effect=fake_post
+    ) as mock_post:
+        client.parse(image_file)
+        client.parse(image_file, concatenate_pages=False)
+
+        urls = [call.args[0] for call in mock_post.call_args_list]
+        assert urls.count("http://test.com/layout-parsing") == 1
+        assert urls.count("http://test.com/restructure-pages") == 2
+
+        # Changing the file contents must invalidate the cached entry
+        image_file.write_bytes(b"different bytes")
+        client.parse(image_file)
+        urls = [call.args[0] for call in mock_post.call_args_list]
+        assert urls.count("http://test.com/layout-parsing") == 2
+
+
+def test_layout_cache_is_off_by_default(client, image_file):
+    """Without layout_cache_size the file is neither hashed nor cached."""
+    with (
+        patch.object(
+            client._api_requester._session,
+            "post",
+            side_effect=lambda url, **kwargs: _mock_response(
+                LAYOUT_RESPONSE
+                if url.endswith("/layout-parsing")
+                else RESTRUCTURE_RESPONSE
+            ),
+        ) as mock_post,
+        patch.object(PaddleOCRVLClient, "_hash_file") as mock_hash,
+    ):
+        client.parse(image_file)
+        client.parse(image_file)
+
+    urls = [call.args[0] for call in mock_post.call_args_list]
+    assert urls.count("http://test.com/layout-parsing") == 2
+    mock_hash.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_layout_cache_hit_async(image_file):
+    """The async path should reuse cached layouts as well."""
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", layout_cache_size=16
+    )
+    request_async = AsyncMock(
+        side_effect=[LAYOUT_RESPONSE, RESTRUCTURE_RESPONSE, RESTRUCTURE_RESPONSE]
+    )
+    with patch.object(client._api_requester, "request_async", new=request_async):
+        first = await client.parse_async(image_file)
+        second = await client.parse_async(image_file)
+
+    assert first == second == "# Title\n\n![fig]()"
+    urls = [call.kwargs["url"] for call in request_async.call_args_list]
+    assert urls.count("http://test.com/layout-parsing") == 1
+
+
+def test_layout_cache_is_isolated_from_results(image_file):
+    """Mutating a returned result must not leak into later parses via the cache."""
+    client = PaddleOCRVLClient(
+        api_key="test_key",
+        base_url="http://test.com",
+        return_layout_info=True,
+        layout_cache_size=16,
+    )
+    restructure_bodies = []
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            return _mock_response(LAYOUT_RESPONSE)
+        restructure_bodies.append(json.loads(kwargs["data"]))
+        return _mock_response(RESTRUCTURE_RESPONSE)
+
+    encode = PaddleOCRVLClient._read_file_as_base64
+    with (
+        patch.object(client._api_requester._session, "post", side_effect=fake_post),
+        patch.object(
+            PaddleOCRVLClient, "_read_file_as_base64", side_effect=encode
+        ) as mock_encode,
+    ):
+        first = client.parse(image_file)
+        first.pages_layout[0].pruned_result["boxes"].append(99)
+        second = client.parse(image_file)
+        second.pages_layout[0].pruned_result["extra"] = True
+        third = client.parse(image_file)
+
+    # Cache hits only hash the file; it is base64-encoded once, on the miss
+    assert mock_encode.call_count == 1
+    assert third.pages_layout[0].pruned_result == {"boxes": [1, 2, 3, 4]}
+    assert [body["pages"][0]["prunedResult"] for body in restructure_bodies] == [
+        {"boxes": [1, 2, 3, 4]}
+    ] * 3
+
+
+@pytest.mark.asyncio
+async def test_http2_transport_uses_httpx(image_file):
+    """With http2=True the async path should go through httpx, not aiohttp."""
+    httpx = pytest.importorskip("httpx")
+    seen = []
+
+    def handler(request):
+        seen.append(str(request.url))
+        payload = (
+            LAYOUT_RESPONSE
+            if request.url.path == "/layout-parsing"
+            else RESTRUCTURE_RESPONSE
+        )
+        return httpx.Response(200, content=json.dumps(payload).encode("utf-8"))
+
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", http2=True
+    )
+    mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with (
+        patch.object(
+            client._api_requester, "_get_httpx_client", return_value=mock_client
+        ),
+        patch.object(client._api_requester, "_get_session") as mock_aiohttp,
+    ):
+        markdown = await client.parse_async(image_file)
+
+    await mock_client.aclose()
+    assert markdown == "# Title\n\n![fig]()"
+    assert seen == [
+        "http://test.com/layout-parsing",
+        "http://test.com/restructure-pages",
+    ]
+    mock_aiohttp.assert_not_called()
+
+
+def test_httpx_client_is_per_loop_and_closed_by_aclose():
+    """Each event loop gets its own httpx client, closed by aclose() on it."""
+    pytest.importorskip("httpx")
+    requester = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", http2=True
+    )._api_requester
+
+    async def use_client():
+        client = requester._get_httpx_client()
+        assert requester._get_httpx_client() is client
+        await requester.aclose()
+        return client
+
+    first = asyncio.run(use_client())
+    second = asyncio.run(use_client())
+
+    assert second is not first
+    assert first.is_closed and second.is_closed
+    assert requester._httpx_client is None
+
+
+@pytest.mark.asyncio
+async def test_http2_client_sized_from_max_concurrency(caplog):
+    """The HTTP/2 client must honor the pool size; plain http:// gets a warning."""
+    httpx = pytest.importorskip("httpx")
+    with caplog.at_level(logging.WARNING):
+        client = PaddleOCRVLClient(
+            api_key="test_key",
+            base_url="http://test.com",
+            http2=True,
+            max_concurrency=64,
+        )
+    assert "only negotiated over TLS" in caplog.text
+
+    with patch.object(httpx, "AsyncClient") as mock_client_cls:
+        client._api_requester._get_httpx_client()
+    limits = mock_client_cls.call_args.kwargs["limits"]
+    assert limits.max_connections == 128
+    assert limits.max_keepalive_connections == 128
+
+
+def test_multipart_falls_back_to_base64_on_415(image_file):
+    """A 415 from the server should switch the client to base64 JSON uploads."""
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", upload_mode="multipart"
+    )
+    layout_calls = []
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            layout_calls.append("files" in kwargs)
+            if "files" in kwargs:
+                return _mock_response(status_code=415, text="Unsupported Media Type")
+            return _mock_response(LAYOUT_RESPONSE)
+        return _mock_response(RESTRUCTURE_RESPONSE)
+
+    with patch.object(client._api_requester._session, "post", side_effect=fake_post):
+        assert client.parse(image_file) == "# Title\n\n![fig]()"
+        image_file.write_bytes(b"other bytes")
+        client.parse(image_file)
+
+    # Multipart is tried once, then every upload goes straight to base64
+    assert layout_calls == [True, False, False]
+
+
+def test_parse_many_preserves_order(client, make_files):
+    """parse_many should parse every file concurrently and keep input order."""
+    paths = make_files(4)
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            name = base64.b64decode(json.loads(kwargs["data"])["file"]).decode()
+            return _mock_response(
+                {"result": {"layoutParsingResults": [{"prunedResult": {"name": name}}]}}
+            )
+        name = json.loads(kwargs["data"])["pages"][0]["prunedResult"]["name"]
+        return _mock_response(
+            {"result": {"layoutParsingResults": [{"markdown": {"text": name}}]}}
+        )
+
+    with patch.object(client._api_requester._session, "post", side_effect=fake_post):
+        results = client.parse_many(paths, concurrency=3)
+
+    assert results == [f"image {i}" for i in range(4)]
+
+
+def test_parse_many_stops_starting_files_after_failure(client, make_files):
+    """A failure must stop queued files even while earlier files still run."""
+    paths = make_files(40)
+    started = []
+
+    def fake_parse(path, concatenate_pages):
+        started.append(path)
+        if path == paths[0]:
+            time.sleep(0.5)
+        elif path == paths[1]:
+            raise APIError("cannot decode file", status_code=500)
+        else:
+            time.sleep(0.01)
+        return "ok"
+
+    with patch.object(client, "parse", side_effect=fake_parse):
+        with pytest.raises(APIError):
+            client.parse_many(paths, concurrency=4)
+
+    assert len(started) < len(paths) // 2
+
+
+@pytest.mark.asyncio
+async def test_parse_async_bounded_by_max_concurrency(make_files):
+    """Concurrent parse_async calls on one client should respect max_concurrency."""
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", max_concurrency=2
+    )
+    paths = make_files(5)
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_request_async(url, headers, payload, **kwargs):
+        nonlocal in_flight, max_in_flight
+        if url.endswith("/layout-parsing"):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            return LAYOUT_RESPONSE
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return RESTRUCTURE_RESPONSE
+
+    with patch.object(
+        client._api_requester, "request_async", side_effect=fake_request_async
+    ):
+        await asyncio.gather(*(client.parse_async(p) for p in paths))
+
+    assert max_in_flight == 2
+
+
+def test_invalid_max_concurrency():
+    """max_concurrency below 1 should be rejected at construction time."""
+    with pytest.raises(ConfigurationError):
+        PaddleOCRVLClient(
+            api_key="test_key", base_url="http://test.com", max_concurrency=0
+        )
+
+
+@pytest.mark.asyncio
+async def test_connection_pool_fits_max_concurrency():
+    """Sync and async pools must fit the 2 x max_concurrency in-flight requests."""
+    async with PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", max_concurrency=64
+    ) as client:
+        adapter = client._api_requester._session.get_adapter("http://test.com")
+        assert adapter._pool_maxsize == 128
+        session = await client._api_requester._get_session()
+        assert session.connector.limit_per_host == 128
+
+        # A requester with the default limit must not share the larger connector
+        other = PaddleOCRVLClient(api_key="test_key", base_url="http://test.com")
+        other_session = await other._api_requester._get_session()
+        assert other_session.connector is not session.connector
+        await other.aclose()
+
+
+def test_aclose_releases_shared_connector_on_each_loop():
+    """aclose() on the owning loop must close the loop's shared connector."""
+    from multi_ocr_sdk.basic_utils.api_requester import _SHARED_CONNECTORS
+
+    client = PaddleOCRVLClient(api_key="test_key", base_url="http://test.com")
+
+    async def use_session():
+        async with client:
+            session = await client._api_requester._get_session()
+            assert session.connector is not None
+            return session.connector
+
+    connectors = [asyncio.run(use_session()) for _ in range(3)]
+
+    assert len(set(map(id, connectors))) == 3
+    assert all(connector.closed for connector in connectors)
+    assert not _SHARED_CONNECTORS
+
+
+def test_closed_loop_is_dropped_from_connector_registry():
+    """A loop closed without aclose() must not stay in the registry."""
+    from multi_ocr_sdk.basic_utils.api_requester import _SHARED_CONNECTORS
+
+    client = PaddleOCRVLClient(api_key="test_key", base_url="http://test.com")
+
+    async def use_session():
+        await client._api_requester._get_session()
+        return asyncio.get_running_loop()
+
+    abandoned_loop = asyncio.run(use_session())
+
+    async def use_and_close():
+        async with client:
+            await client._api_requester._get_session()
+            assert abandoned_loop not in _SHARED_CONNECTORS
+
+    asyncio.run(use_and_close())
+    assert not _SHARED_CONNECTORS
+
+
+def test_compress_requests_gzips_json_body(image_file):
+    """compress_requests should send a gzip body with Content-Encoding set."""
+    client = PaddleOCRVLClient(
+        api_key="test_key", base_url="http://test.com", compress_requests=True
+    )
+    with patch.object(
+        client._api_requester._session,
+        "post",
+        side_effect=[
+            _mock_response(LAYOUT_RESPONSE),
+            _mock_response(RESTRUCTURE_RESPONSE),
+        ],
+    ) as mock_post:
+        client.parse(image_file)
+
+    layout_kwargs = mock_post.call_args_list[0].kwargs
+    assert layout_kwargs["headers"]["Content-Encoding"] == "gzip"
+    payload = json.loads(gzip.decompress(layout_kwargs["data"]))
+    assert payload["file"] == base64.b64encode(b"fake image bytes").decode("ascii")
+
+
+def test_stdlib_json_fallback(client, image_file):
+    """Without orjson the requester should fall back to the stdlib json module."""
+    with (
+        patch("multi_ocr_sdk.basic_utils.api_requester.orjson", None),
+        patch.object(
+            client._api_requester._session,
+            "post",
+            side_effect=[
+                _mock_response(LAYOUT_RESPONSE),
+                _mock_response(RESTRUCTURE_RESPONSE),
+            ],
+        ) as mock_post,
+    ):
+        markdown = client.parse(image_file)
+
+    assert markdown == "# Title\n\n![fig]()"
+    body = mock_post.call_args_list[0].kwargs["data"]
+    assert isinstance(body, bytes)
+    assert json.loads(body)["fileType"] == 1
+
+
+def test_single_page_skips_restructure(image_file):
+    """A single page that already has markdown should skip /restructure-pages."""
+    layout_response = {
+        "result": {
+            "layoutParsingResults": [
+                {
+                    "prunedResult": {},
+                    "markdown": {"text": "# Page\n\n![x](data:image/png;base64,AAAA)"},
+                }
+            ]
+        }
+    }
+    client = PaddleOCRVLClient(api_key="test_key", base_url="http://test.com")
+    with patch.object(
+        client._api_requester._session,
+        "post",
+        return_value=_mock_response(layout_response),
+    ) as mock_post:
+        assert client.parse(image_file) == "# Page\n\n![x]()"
+    assert mock_post.call_count == 1
+
+    client = PaddleOCRVLClient(
+        api_key="test_key",
+        base_url="http://test.com",
+        skip_single_page_restructure=False,
+    )
+    with patch.object(
+        client._api_requester._session,
+        "post",
+        side_effect=[
+            _mock_response(layout_response),
+            _mock_response(RESTRUCTURE_RESPONSE),
+        ],
+    ) as mock_post:
+        assert client.parse(image_file) == "# Title\n\n![fig]()"
+    assert mock_post.call_count == 2
+
+
+def test_read_file_as_base64_empty_file(tmp_path):
+    """Empty files cannot be memory-mapped and must still encode correctly."""
+    path = tmp_path / "empty.pdf"
+    path.write_bytes(b"")
+    assert PaddleOCRVLClient._read_file_as_base64(path) == b""
+
+
+def test_rejected_visualize_flag_is_dropped(client, image_file):
+    """If the server rejects visualize=False, retry and keep omitting the flag."""
+    layout_bodies = []
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            body = json.loads(kwargs["data"])
+            layout_bodies.append(body)
+            if "visualize" in body:
+                return _mock_response(
+                    status_code=422, text="extra fields not permitted"
+                )
+            return _mock_response(LAYOUT_RESPONSE)
+        return _mock_response(RESTRUCTURE_RESPONSE)
+
+    with patch.object(client._api_requester._session, "post", side_effect=fake_post):
+        assert client.parse(image_file) == "# Title\n\n![fig]()"
+        image_file.write_bytes(b"other bytes")
+        client.parse(image_file)
+
+    assert ["visualize" in body for body in layout_bodies] == [True, False, False]
+
+
+def test_stream_responses_parses_markdown_incrementally(image_file):
+    """With stream_responses, markdown text is read from the raw response stream."""
+    pytest.importorskip("ijson")
+    client = PaddleOCRVLClient(
+        api_key="test_key",
+        base_url="http://test.com",
+        skip_single_page_restructure=False,
+        stream_responses=True,
+    )
+    restructure_response = MagicMock()
+    restructure_response.status_code = 200
+    restructure_response.raw = io.BytesIO(
+        json.dumps(RESTRUCTURE_RESPONSE).encode("utf-8")
+    )
+
+    with patch.object(
+        client._api_requester._session,
+        "post",
+        side_effect=[_mock_response(LAYOUT_RESPONSE), restructure_response],
+    ) as mock_post:
+        assert client.parse(image_file) == "# Title\n\n![fig]()"
+
+    assert mock_post.call_args.kwargs["stream"] is True
+    restructure_response.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_parse_async_times_out_against_slow_server(image_file):
+    """The configured timeout must apply to real aiohttp requests."""
+
+    async def slow_handler(request):
+        await asyncio.sleep(5)
+        return web.json_response(LAYOUT_RESPONSE)
+
+    app = web.Application()
+    app.router.add_post("/layout-parsing", slow_handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with PaddleOCRVLClient(
+            api_key="test_key", base_url=str(server.make_url("")), timeout=1
+        ) as client:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            with pytest.raises(SDKTimeoutError):
+                await client.parse_async(image_file)
+            assert loop.time() - start < 3
+    finally:
+        await server.close()
+
+
+def test_bad_file_does_not_drop_visualize_flag(client, tmp_path):
+    """A 400 caused by the file itself must not turn off visualize=False."""
+    bad_file = tmp_path / "bad.png"
+    bad_file.write_bytes(b"corrupt")
+    good_file = tmp_path / "good.png"
+    good_file.write_bytes(b"fine")
+    layout_bodies = []
+
+    def fake_post(url, **kwargs):
+        if url.endswith("/layout-parsing"):
+            body = json.loads(kwargs["data"])
+            layout_bodies.append(body)
+            if base64.b64decode(body["file"]) == b"corrupt":
+                return _mock_response(status_code=400, text="cannot decode file")
+            return _mock_response(LAYOUT_RESPONSE)
+        return _mock_response(RESTRUCTURE_RESPONSE)
+
+    with patch.object(client._api_requester._session, "post", side_effect=fake_post):
+        with pytest.raises(APIError) as exc_info:
+            client.parse(bad_file)
+        assert exc_info.value.response_text == "cannot decode file"
+        client.parse(good_file)
+
+    # The failed retry without the flag does not stick for later requests
+    assert ["visualize" in body for body in layout_bodies] == [True, False, True]
@@ -8,9 +8,12 @@ from typing import Awaitable, Callable
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
-from multi_ocr_sdk import DeepSeekOCR
-from multi_ocr_sdk.exceptions import RateLimitError
+from multi_ocr_sdk import DeepSeekOCR, PaddleOCRVLClient, VLMClient
+from multi_ocr_sdk.basic_utils import APIRequester, RateLimiter
+from multi_ocr_sdk.exceptions import APIError, RateLimitError
 
 
 @pytest.fixture
@@ -369,3 +372,181 @@ async def test_concurrent_requests_with_multipage_pdf():
         for i in range(1, len(request_times)):
             time_diff = request_times[i] - request_times[i - 1]
             assert time_diff >= 0.25  # Allow small tolerance
+
+
+def test_retry_delay_jitter_bounds():
+    """Retry delay should be jittered within [0, base * 2^attempt] and capped."""
+    limiter = RateLimiter(retry_delay=0.5, max_retry_delay=3.0)
+
+    for attempt in range(3):
+        for _ in range(50):
+            delay = limiter.get_retry_delay(attempt)
+            assert 0.0 <= delay <= 0.5 * (2**attempt)
+
+    # Large attempts are clamped to max_retry_delay
+    assert limiter.get_retry_delay(10) <= 3.0
+
+
+def test_first_retry_is_jittered():
+    """Even the first retry must be spread out, not fixed at retry_delay."""
+    limiter = RateLimiter(retry_delay=0.5, max_retry_delay=30.0)
+
+    delays = {limiter.get_retry_delay(0) for _ in range(20)}
+    assert len(delays) > 1
+    assert min(delays) < 0.5
+
+
+def test_retry_delay_honors_retry_after():
+    """A numeric Retry-After header takes precedence over computed backoff."""
+    limiter = RateLimiter(retry_delay=0.5, max_retry_delay=30.0)
+
+    assert limiter.get_retry_delay(0, "7") == 7.0
+    # The cap applies to computed backoff only, never to the server's value
+    assert limiter.get_retry_delay(0, "120") == 120.0
+    assert limiter.exceeds_max_delay(120.0)
+    # Unparseable values fall back to the jittered backoff
+    assert 0.0 <= limiter.get_retry_delay(1, "Wed, 21 Oct 2015 07:28:00 GMT") <= 1.0
+
+
+def test_retry_sleep_hook_and_disabled_retry():
+    """Sync retries use the configurable sleep hook; disabled retry makes one call."""
+    sleeps = []
+    limiter = RateLimiter(retry_delay=0.5, max_retries=2, retry_sleep=sleeps.append)
+    requester = APIRequester(limiter, timeout=10)
+
+    rate_limited = MagicMock(status_code=429, text="Rate limit exceeded", headers={})
+    ok = MagicMock(status_code=200, headers={}, content=b'{"ok": true}')
+
+    with patch.object(
+        requester._session, "post", side_effect=[rate_limited, rate_limited, ok]
+    ) as mock_post:
+        assert requester.request_sync("http://test.com", {}, {}) == {"ok": True}
+    assert mock_post.call_count == 3
+    assert len(sleeps) == 2
+
+    with patch.object(
+        requester._session, "post", return_value=rate_limited
+    ) as mock_post:
+        with pytest.raises(RateLimitError):
+            requester.request_sync(
+                "http://test.com", {}, {}, enable_rate_limit_retry=False
+            )
+    assert mock_post.call_count == 1
+
+
+def test_quota_error_body_is_retried():
+    """Non-429 errors that report a rate limit or quota should be retried."""
+    sleeps = []
+    limiter = RateLimiter(retry_delay=0.5, max_retries=2, retry_sleep=sleeps.append)
+    requester = APIRequester(limiter, timeout=10)
+
+    quota = MagicMock(status_code=403, text="Quota exceeded for this key", headers={})
+    ok = MagicMock(status_code=200, headers={}, content=b'{"ok": true}')
+    with patch.object(requester._session, "post", side_effect=[quota, ok]):
+        assert requester.request_sync("http://test.com", {}, {}) == {"ok": True}
+    assert len(sleeps) == 1
+
+    failure = MagicMock(status_code=500, text="Internal error", headers={})
+    with patch.object(requester._session, "post", return_value=failure) as mock_post:
+        with pytest.raises(APIError):
+            requester.request_sync("http://test.com", {}, {})
+    assert mock_post.call_count == 1
+
+    # Markers only count on throttling status codes, not on validation errors
+    invalid = MagicMock(
+        status_code=400, text="field rate_limit must be int", headers={}
+    )
+    with patch.object(requester._session, "post", return_value=invalid) as mock_post:
+        with pytest.raises(APIError) as exc_info:
+            requester.request_sync("http://test.com", {}, {})
+    assert not isinstance(exc_info.value, RateLimitError)
+    assert mock_post.call_count == 1
+    assert len(sleeps) == 1
+
+
+@pytest.mark.parametrize(
+    "make_client",
+    [
+        lambda **kw: DeepSeekOCR(api_key="test_key", base_url="http://test.com", **kw),
+        lambda **kw: PaddleOCRVLClient(
+            api_key="test_key", base_url="http://test.com", **kw
+        ),
+        lambda **kw: VLMClient(
+            api_key="test_key", base_url="http://test.com/v1", model="m", **kw
+        ),
+    ],
+)
+def test_clients_pass_retry_sleep_to_rate_limiter(make_client):
+    """retry_sleep given to a client should be used for its sync 429 backoff."""
+    sleeps = []
+    client = make_client(rate_limit_retry_delay=0.5, retry_sleep=sleeps.append)
+    requester = client._api_requester
+
+    rate_limited = MagicMock(status_code=429, text="Too many requests", headers={})
+    ok = MagicMock(status_code=200, headers={}, content=b'{"ok": true}')
+    with patch.object(requester._session, "post", side_effect=[rate_limited, ok]):
+        assert requester.request_sync("http://test.com", {}, {}) == {"ok": True}
+    assert len(sleeps) == 1
+
+
+def test_async_rate_limit_across_event_loops():
+    """One RateLimiter must keep working when reused across asyncio.run() calls."""
+    limiter = RateLimiter(request_delay=0.01)
+
+    async def burst():
+        # Concurrent callers make the lock actually wait, binding it to this loop
+        await asyncio.gather(*(limiter.apply_rate_limit_async() for _ in range(3)))
+
+    asyncio.run(burst())
+    asyncio.run(burst())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http2", [False, True])
+async def test_async_transports_share_retry_handling(http2):
+    """aiohttp and httpx requests should retry 429s and surface errors the same way."""
+    if http2:
+        pytest.importorskip("httpx")
+    statuses = [429, 200, 400]
+
+    async def handler(request):
+        status = statuses.pop(0)
+        if status == 200:
+            return web.json_response({"ok": True})
+        return web.Response(status=status, text="error")
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    requester = APIRequester(RateLimiter(retry_delay=0.01), timeout=10, http2=http2)
+    try:
+        url = str(server.make_url("/"))
+        assert await requester.request_async(url, {}, {}) == {"ok": True}
+        with pytest.raises(APIError) as exc_info:
+            await requester.request_async(url, {}, {})
+        assert not isinstance(exc_info.value, RateLimitError)
+        assert exc_info.value.status_code == 400
+    finally:
+        await requester.aclose()
+        await server.close()
+
+
+def test_retry_after_above_cap_fails_fast():
+    """A Retry-After above max_retry_delay should raise at once, not retry early."""
+    sleeps = []
+    limiter = RateLimiter(
+        retry_delay=0.5, max_retries=3, max_retry_delay=30.0, retry_sleep=sleeps.append
+    )
+    requester = APIRequester(limiter, timeout=10)
+
+    rate_limited = MagicMock(
+        status_code=429, text="Too many requests", headers={"Retry-After": "120"}
+    )
+    with patch.object(
+        requester._session, "post", return_value=rate_limited
+    ) as mock_post:
+        with pytest.raises(RateLimitError, match="retry after 120s"):
+            requester.request_sync("http://test.com", {}, {})
+    assert mock_post.call_count == 1
+    assert sleeps == []
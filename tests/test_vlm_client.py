@@ -2,6 +2,8 @@
 不太懂pytest怎么用，先让ai写了个，大佬完善一下
 """
 
+from unittest.mock import patch
+
 from multi_ocr_sdk import VLMClient, vlm_client
 
 
@@ -16,3 +18,11 @@ def test_vlm_import_and_structure():
     assert hasattr(client.chat.completions, "create")
 
 
+def test_context_manager_closes_session():
+    """Leaving the with-block should close the underlying session."""
+    with patch("requests.Session.close") as mock_close:
+        with VLMClient(
+            api_key="test", base_url="http://localhost:8000/v1", model="test-model"
+        ):
+            pass
+    mock_close.assert_called_once()